@@ -0,0 +1,80 @@
+"""Время отрисовки страницы ленты с кэшем карточек и без него.
+
+python benchmarks/bench_post_cards.py --posts 2000 --pages 20
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from utils import describe, measure, setup_django, test_database
+
+
+def seed(posts):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Location, Post
+
+    user = get_user_model().objects.create_user('bench', password='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Категория бенчмарка', slug='bench'
+    )
+    location = Location.objects.create(name='Лаборатория')
+    now = timezone.now()
+    words = 'быстро медленно кэш карточка лента страница запрос ответ'.split()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {number}',
+            text=' '.join(random.choices(words, k=60)),
+            pub_date=now - timedelta(minutes=number),
+            author=user,
+            category=category,
+            location=location,
+            comment_count=random.randint(0, 500),
+            is_visible=True,
+        )
+        for number in range(posts)
+    )
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.test import Client, override_settings
+
+    with test_database():
+        user = seed(args.posts)
+        client = Client()
+        # Авторизованный клиент обходит кэш целых страниц.
+        client.force_login(user)
+        urls = [f'/?page={page}' for page in range(1, args.pages + 1)]
+
+        def render_pages():
+            for url in urls:
+                assert client.get(url).status_code == 200
+
+        with override_settings(POST_CARD_CACHE_TIMEOUT=0):
+            render_pages()
+            before = measure(render_pages, args.repeat)
+        cache.clear()
+        render_pages()
+        after = measure(render_pages, args.repeat)
+
+    per_page = [
+        [timing / len(urls) for timing in timings]
+        for timings in (before, after)
+    ]
+    print(f'Страниц: {len(urls)}, публикаций: {args.posts}')
+    print(f'Без кэша карточек: {describe(per_page[0])} на страницу')
+    print(f'С кэшем карточек:  {describe(per_page[1])} на страницу')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Поиск публикаций: LIKE '%слово%' против индекса FTS5.
+
+По умолчанию база заполняется миллионом публикаций; для быстрой проверки
+уменьшите --posts.
+
+python benchmarks/bench_search.py --posts 1000000
+"""
+import argparse
+import random
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from utils import describe, measure, setup_django, test_database
+
+WORDS = (
+    'кэш лента страница запрос ответ индекс база поиск публикация автор '
+    'категория комментарий транзакция реплика очередь счётчик шаблон '
+    'карточка пагинация курсор миграция триггер соединение журнал'
+).split()
+RARE_WORDS = 'производительность масштабирование'.split()
+
+
+def seed(posts, batch=10000):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    user = get_user_model().objects.create_user('bench', password='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Категория бенчмарка', slug='bench'
+    )
+    now = timezone.now()
+    for start in range(0, posts, batch):
+        Post.objects.bulk_create(
+            Post(
+                title=' '.join(random.choices(WORDS, k=4)),
+                text=' '.join(
+                    random.choices(WORDS, k=40)
+                    + random.choices(RARE_WORDS, k=random.random() < 0.01)
+                ),
+                pub_date=now - timedelta(minutes=number),
+                author=user,
+                category=category,
+                is_visible=True,
+            )
+            for number in range(start, min(start + batch, posts))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Q
+
+    from blog.models import Post
+    from blog.utils import search_posts
+    from blogicum.constants import NUM_OF_POSTS
+
+    def like(text):
+        return Post.post_objects.filter(
+            Q(title__icontains=text) | Q(text__icontains=text)
+        ).order_by('-pub_date', '-id')
+
+    with tempfile.TemporaryDirectory() as directory:
+        with test_database(name=Path(directory) / 'bench.sqlite3'):
+            seed(args.posts)
+            for word in ('производительность', 'триггер'):
+                for title, search in (('LIKE', like), ('FTS5', search_posts)):
+                    def first_page():
+                        queryset = search(word)
+                        queryset.count()
+                        list(queryset[:NUM_OF_POSTS])
+
+                    timings = measure(first_page, args.repeat)
+                    print(f'{word!r} {title}: {describe(timings)}')
+    print(f'Публикаций: {args.posts}')
+
+
+if __name__ == '__main__':
+    main()
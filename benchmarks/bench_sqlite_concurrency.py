@@ -0,0 +1,130 @@
+"""Пропускная способность SQLite при одновременных чтении и записи.
+
+Сравнивает соединения без настроек (журнал DELETE, новое соединение
+на каждый запрос) с профилем SQLITE_PRAGMAS и CONN_MAX_AGE.
+
+python benchmarks/bench_sqlite_concurrency.py --readers 8 --writers 2
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from utils import setup_django, test_database
+
+
+def seed(posts):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    user = get_user_model().objects.create_user('bench', password='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Категория бенчмарка', slug='bench'
+    )
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {number}',
+            text='Текст публикации',
+            pub_date=now,
+            author=user,
+            category=category,
+            is_visible=True,
+        )
+        for number in range(posts)
+    )
+    return user, list(Post.objects.values_list('pk', flat=True))
+
+
+def run(duration, readers, writers, user, post_ids):
+    from django.db import OperationalError, close_old_connections, transaction
+
+    from blog.models import Comment
+    from blog.utils import get_all_post_published_query
+
+    def read():
+        list(get_all_post_published_query()[:10])
+
+    def write():
+        with transaction.atomic():
+            Comment.objects.create(
+                text='Комментарий',
+                author=user,
+                post_id=post_ids[int(time.time() * 1000) % len(post_ids)],
+            )
+
+    stats = {'read': 0, 'write': 0, 'locked': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(operation, kind):
+        done = locked = 0
+        while time.monotonic() < deadline:
+            try:
+                operation()
+                done += 1
+            except OperationalError:
+                locked += 1
+            # Граница запроса: так Django закрывает или сохраняет
+            # соединение в зависимости от CONN_MAX_AGE.
+            close_old_connections()
+        from django.db import connection
+        connection.close()
+        with lock:
+            stats[kind] += done
+            stats['locked'] += locked
+
+    threads = [
+        threading.Thread(target=worker, args=(read, 'read'))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(target=worker, args=(write, 'write'))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection, connections
+
+    profiles = {
+        'Без настроек': ({'journal_mode': 'DELETE'}, 0),
+        'SQLITE_PRAGMAS': (settings.SQLITE_PRAGMAS, 60),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        with test_database(name=Path(directory) / 'bench.sqlite3'):
+            user, post_ids = seed(args.posts)
+            for title, (pragmas, max_age) in profiles.items():
+                connections.close_all()
+                settings.SQLITE_PRAGMAS = pragmas
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                stats = run(
+                    args.duration, args.readers, args.writers, user, post_ids
+                )
+                print(
+                    f'{title}: '
+                    f'чтений {stats["read"] / args.duration:.0f}/с, '
+                    f'записей {stats["write"] / args.duration:.0f}/с, '
+                    f'ошибок блокировки {stats["locked"]}'
+                )
+            connections.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Комментариев в секунду при параллельных клиентах с очередью записи и без.
+
+Клиенты отправляют форму комментария через полный стек представлений.
+
+python benchmarks/bench_write_queue.py --clients 16 --duration 5
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from utils import setup_django, test_database
+
+
+def seed(clients):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    User = get_user_model()
+    author = User.objects.create_user('author', password='bench')
+    category = Category.objects.create(
+        title='Бенчмарк', description='Категория бенчмарка', slug='bench'
+    )
+    post = Post.objects.create(
+        title='Публикация',
+        text='Текст публикации',
+        pub_date=timezone.now(),
+        author=author,
+        category=category,
+    )
+    users = [
+        User.objects.create_user(f'reader{number}', password='bench')
+        for number in range(clients)
+    ]
+    return post, users
+
+
+def run(duration, post, users):
+    from django.db import connection
+    from django.test import Client
+
+    url = f'/posts/{post.pk}/comment/'
+    counts = []
+    errors = []
+    deadline = time.monotonic() + duration
+
+    def worker(user):
+        client = Client()
+        client.force_login(user)
+        done = failed = 0
+        while time.monotonic() < deadline:
+            try:
+                response = client.post(url, data={'text': 'Комментарий'})
+                if response.status_code == 302:
+                    done += 1
+                else:
+                    failed += 1
+            except Exception:
+                failed += 1
+        connection.close()
+        counts.append(done)
+        errors.append(failed)
+
+    threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts), sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connections
+
+    from blog.write_queue import stop_write_queue
+
+    with tempfile.TemporaryDirectory() as directory:
+        with test_database(name=Path(directory) / 'bench.sqlite3'):
+            post, users = seed(args.clients)
+            profiles = (('Без очереди', False), ('С очередью', True))
+            for title, enabled in profiles:
+                connections.close_all()
+                settings.WRITE_QUEUE_ENABLED = enabled
+                done, failed = run(args.duration, post, users)
+                stop_write_queue()
+                print(
+                    f'{title}: {done / args.duration:.0f} комментариев/с, '
+                    f'ошибок {failed}'
+                )
+            connections.close_all()
+    print(f'Клиентов: {args.clients}')
+
+
+if __name__ == '__main__':
+    main()
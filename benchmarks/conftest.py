@@ -0,0 +1,181 @@
+"""Набор бенчмарков представлений с порогами регрессии.
+
+python -m pytest benchmarks
+python -m pytest benchmarks --bench-update    # записать baseline.json
+python -m pytest benchmarks --bench-margin 0.5
+
+Данные создаются один раз на сессию командой seed_blog. Каждый замер
+сравнивается с baseline.json: медиана времени не должна превышать
+базовую больше чем на --bench-margin, количество запросов к БД не должно
+расти. Время зависит от машины, поэтому базу стоит обновлять на той же
+машине, где запускаются сравнения.
+"""
+import io
+import json
+import statistics
+from pathlib import Path
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+from utils import measure
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption(
+        '--bench-margin', type=float, default=0.3,
+        help='Допустимое превышение базового времени (доля).',
+    )
+    group.addoption(
+        '--bench-update', action='store_true',
+        help='Записать результаты в baseline.json вместо сравнения.',
+    )
+    group.addoption('--bench-baseline', default=str(BASELINE))
+    group.addoption('--bench-repeat', type=int, default=7)
+    group.addoption(
+        '--bench-posts', type=int, default=20000,
+        help='Количество публикаций в наборе данных.',
+    )
+
+
+@pytest.fixture(autouse=True, scope='session')
+def isolated_cache():
+    """Отдельный кэш в памяти на время замеров.
+
+    Замеры очищают кэш, и кэш запущенного сервера не должен пострадать.
+    Бенчмарки сравнивают код представлений, а baseline.json записан
+    с LocMemCache, поэтому замеры идут с ним же: стоимость записи в
+    FileBasedCache (см. CACHES в settings.py) зависит от развёртывания.
+    """
+    caches = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+    with override_settings(CACHES=caches):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def production_debug():
+    with override_settings(DEBUG=False):
+        yield
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker, pytestconfig):
+    from django.core.management import call_command
+
+    posts = pytestconfig.getoption('bench_posts')
+    with django_db_blocker.unblock():
+        call_command(
+            'seed_blog', '--users', str(max(10, posts // 50)),
+            '--posts', str(posts), '--comments', str(posts * 5),
+            '--seed', '1', stdout=io.StringIO(),
+        )
+
+
+@pytest.fixture(scope='session')
+def dataset(django_db_setup, django_db_blocker):
+    """Объекты набора данных, на которых выполняются замеры."""
+    from django.db.models import Count, Q
+
+    from blog.models import Category, Post, User
+
+    with django_db_blocker.unblock():
+        busiest = Post.post_objects.order_by('-comment_count').first()
+        author = User.objects.annotate(
+            total=Count('posts', filter=Q(posts__is_visible=True))
+        ).order_by('-total').first()
+        category = Category.objects.annotate(
+            total=Count('posts')
+        ).order_by('-total').first()
+        visitor = User.objects.exclude(pk=author.pk).first()
+    return {
+        'post': busiest,
+        'author': author,
+        'category': category,
+        'visitor': visitor,
+    }
+
+
+class Bench:
+    """Замер времени и количества запросов с проверкой по базе."""
+
+    def __init__(self, config, results):
+        self.margin = config.getoption('bench_margin')
+        self.update = config.getoption('bench_update')
+        self.repeat = config.getoption('bench_repeat')
+        path = Path(config.getoption('bench_baseline'))
+        self.baseline = (
+            json.loads(path.read_text(encoding='utf-8'))
+            if path.exists() else {}
+        )
+        self.results = results
+
+    def __call__(self, name, func, prepare=None):
+        """Замерить func.
+
+        prepare вызывается перед каждым запуском func вне замера
+        времени и подсчёта запросов.
+        """
+        prepare = prepare or (lambda: None)
+        prepare()
+        func()
+        prepare()
+        # Журнал запросов ограничен 9000 записями и уже заполнен при
+        # создании данных, а каждый запрос клиента его очищает: число
+        # запросов берётся сразу после захвата.
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        query_count = len(queries)
+        timings = measure(func, self.repeat, prepare)
+        result = {
+            'median_ms': round(statistics.median(timings) * 1000, 2),
+            'queries': query_count,
+        }
+        self.results[name] = result
+        if self.update:
+            return result
+        base = self.baseline.get(name)
+        if base is None:
+            pytest.skip(f'Для {name} нет базового значения; --bench-update.')
+        limit = base['median_ms'] * (1 + self.margin)
+        assert result['queries'] <= base['queries'], (
+            f'{name}: запросов к БД {result["queries"]}, '
+            f'в базе {base["queries"]}.'
+        )
+        assert result['median_ms'] <= limit, (
+            f'{name}: медиана {result["median_ms"]} мс, допустимо '
+            f'{limit:.2f} мс (база {base["median_ms"]} мс '
+            f'+ {self.margin:.0%}).'
+        )
+        return result
+
+
+@pytest.fixture(scope='session')
+def bench_results(pytestconfig):
+    results = {}
+    yield results
+    if pytestconfig.getoption('bench_update') and results:
+        path = Path(pytestconfig.getoption('bench_baseline'))
+        baseline = (
+            json.loads(path.read_text(encoding='utf-8'))
+            if path.exists() else {}
+        )
+        baseline.update(results)
+        path.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n',
+            encoding='utf-8',
+        )
+
+
+@pytest.fixture
+def bench(pytestconfig, bench_results):
+    return Bench(pytestconfig, bench_results)
@@ -0,0 +1,65 @@
+"""Бенчмарки основных представлений блога (см. conftest.py)."""
+from django.core.cache import cache
+from django.test import Client
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get(client, url, status=200):
+    def request():
+        assert client.get(url).status_code == status
+
+    return request
+
+
+@pytest.fixture
+def visitor_client(dataset):
+    client = Client()
+    client.force_login(dataset['visitor'])
+    return client
+
+
+@pytest.fixture
+def author_client(dataset):
+    client = Client()
+    client.force_login(dataset['author'])
+    return client
+
+
+# Кэш очищается перед каждым запуском: замеряется полная отрисовка, а не
+# попадание в кэш страниц и карточек.
+
+def test_index(bench, visitor_client):
+    bench('index', _get(visitor_client, '/?page=2'), prepare=cache.clear)
+
+
+def test_category(bench, dataset, visitor_client):
+    url = f'/category/{dataset["category"].slug}/'
+    bench('category', _get(visitor_client, url), prepare=cache.clear)
+
+
+def test_profile_visitor(bench, dataset, visitor_client):
+    url = f'/profile/{dataset["author"].username}/'
+    bench('profile_visitor', _get(visitor_client, url), prepare=cache.clear)
+
+
+def test_profile_owner(bench, dataset, author_client):
+    url = f'/profile/{dataset["author"].username}/'
+    bench('profile_owner', _get(author_client, url), prepare=cache.clear)
+
+
+def test_post_detail_many_comments(bench, dataset, visitor_client):
+    url = f'/posts/{dataset["post"].pk}/'
+    bench('post_detail', _get(visitor_client, url), prepare=cache.clear)
+
+
+def test_comment_create(bench, dataset, visitor_client):
+    url = f'/posts/{dataset["post"].pk}/comment/'
+
+    def create():
+        response = visitor_client.post(url, {'text': 'Комментарий'})
+        assert response.status_code == 302
+
+    bench('comment_create', create)
@@ -0,0 +1,73 @@
+"""Общая подготовка окружения Django для бенчмарков.
+
+Бенчмарки запускаются из корня репозитория, например:
+python benchmarks/bench_post_cards.py
+"""
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def setup_django():
+    """Подключить настройки проекта и инициализировать Django."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False, name=None):
+    """Создать тестовую БД на время бенчмарка и удалить её после.
+
+    name задаёт файл тестовой БД SQLite: параллельный доступ имеет
+    смысл проверять только на файле, а не на БД в памяти.
+    """
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment, teardown_test_environment
+    )
+
+    if name is not None:
+        connection.settings_dict['TEST']['NAME'] = str(name)
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
+        teardown_test_environment()
+
+
+def measure(func, repeat, prepare=None):
+    """Выполнить func repeat раз и вернуть длительности в секундах.
+
+    prepare, если задана, вызывается перед каждым запуском вне замера.
+    """
+    timings = []
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def describe(timings):
+    """Вернуть строку с медианой и p95 в миллисекундах."""
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f'median {statistics.median(ordered) * 1000:.2f} ms, '
+        f'p95 {p95 * 1000:.2f} ms'
+    )
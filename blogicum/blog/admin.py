@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .models import (
+    Category, Comment, CommentNotification, ImageJob, Location, Post
+)
+from .utils import search_posts
 
 
 class BlogAdmin(admin.ModelAdmin):
@@ -59,6 +62,7 @@ class PostAdmin(BlogAdmin):
         'author',
         'category',
         'location',
+        'comment_count',
         'created_at',
     )
     list_editable = (
@@ -68,6 +72,12 @@ class PostAdmin(BlogAdmin):
     list_filter = ('is_published',)
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет по полнотекстовому индексу вместо LIKE по заголовку."""
+        if not search_term:
+            return queryset, False
+        return search_posts(search_term, queryset), False
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -80,3 +90,35 @@ class CommentAdmin(admin.ModelAdmin):
         'created_at',
     )
     list_filter = ('text',)
+
+
+@admin.register(CommentNotification)
+class CommentNotificationAdmin(admin.ModelAdmin):
+    """Админка для Уведомлений о комментариях."""
+
+    list_display = (
+        'recipient',
+        'subject',
+        'created_at',
+        'attempts',
+        'next_attempt_at',
+        'sent_at',
+    )
+    list_filter = ('sent_at',)
+    readonly_fields = ('comment',)
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    """Админка для Обработки изображений."""
+
+    list_display = (
+        'source',
+        'post',
+        'created_at',
+        'attempts',
+        'next_attempt_at',
+        'finished_at',
+    )
+    list_filter = ('finished_at',)
+    readonly_fields = ('post',)
@@ -0,0 +1,210 @@
+"""Модуль с версионированием кэшированных страниц блога.
+
+Каждая страница зависит от набора меток (ленты, публикации, категории,
+автора). Инвалидация увеличивает версию метки, после чего все записи,
+сохранённые со старой версией, считаются устаревшими. Чтобы метки видели
+и веб-процессы, и фоновые команды, кэш должен быть общим (не LocMem).
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+TAG_VERSION_KEY = 'blog:tag:{}'
+PAGE_KEY = 'blog:page:{}'
+PAGE_STATS_KEY = 'blog:page-stats:{}'
+CARD_KEY = 'blog:card:{}'
+COUNT_KEY = 'blog:count:{}'
+
+
+def feed_tags(post):
+    """Вернуть метки лент, в которых может оказаться публикация."""
+    tags = ['feed:index', f'feed:profile:{post.author_id}']
+    if post.category_id is not None:
+        tags.append(f'feed:category:{post.category_id}')
+    return tags
+
+
+def post_tags(post):
+    """Вернуть метки содержимого карточки или страницы публикации."""
+    tags = [f'post:{post.pk}', f'user:{post.author_id}']
+    if post.category_id is not None:
+        tags.append(f'category:{post.category_id}')
+    if post.location_id is not None:
+        tags.append(f'location:{post.location_id}')
+    return tags
+
+
+def posts_tags(posts):
+    """Вернуть метки содержимого для списка публикаций."""
+    return [tag for post in posts for tag in post_tags(post)]
+
+
+def get_tag_versions(tags):
+    """Вернуть словарь текущих версий меток.
+
+    Отсутствующей версии (метку ещё не сбрасывали или кэш её вытеснил)
+    присваивается новая: иначе после вытеснения снова стали бы
+    действительны записи, сохранённые до первого сброса метки.
+    """
+    keys = {TAG_VERSION_KEY.format(tag): tag for tag in tags}
+    stored = cache.get_many(keys)
+    missing = [key for key in keys if key not in stored]
+    if missing:
+        version = time.time_ns()
+        for key in missing:
+            # Если версию одновременно добавил другой процесс, записи
+            # с нашей версией просто окажутся устаревшими.
+            cache.add(key, version, timeout=None)
+            stored[key] = version
+    return {tag: stored[key] for key, tag in keys.items()}
+
+
+def invalidate_tags(*tags):
+    """Сделать устаревшими все записи кэша, зависящие от меток.
+
+    Новая версия — время в наносекундах, а не incr(): она записывается
+    одним set_many без чтения и не теряется, когда метку одновременно
+    сбрасывают несколько процессов (в FileBasedCache incr не атомарен).
+    """
+    if tags:
+        version = time.time_ns()
+        cache.set_many(
+            {TAG_VERSION_KEY.format(tag): version for tag in set(tags)},
+            timeout=None,
+        )
+
+
+def _page_key(path):
+    return PAGE_KEY.format(hashlib.md5(path.encode()).hexdigest())
+
+
+def _count(event):
+    # Счётчик — это запись в общий кэш на каждый запрос, и incr в
+    # FileBasedCache не атомарен, поэтому статистика включается
+    # только на время замеров.
+    if not settings.PAGE_CACHE_STATS:
+        return
+    key = PAGE_STATS_KEY.format(event)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_cached_page(path):
+    """Вернуть сохранённую страницу, если ни одна её метка не устарела."""
+    entry = cache.get(_page_key(path))
+    if entry is not None and get_tag_versions(entry['tags']) == entry['tags']:
+        _count('hits')
+        response = HttpResponse(
+            entry['content'], content_type=entry['content_type']
+        )
+        response['X-Page-Cache'] = 'hit'
+        return response
+    _count('misses')
+    return None
+
+
+def store_page(path, response, tags):
+    """Сохранить отрисованную страницу вместе с версиями её меток."""
+    cache.set(
+        _page_key(path),
+        {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'tags': get_tag_versions(tags),
+        },
+        settings.PAGE_CACHE_TIMEOUT,
+    )
+
+
+def get_page_cache_stats():
+    """Вернуть счётчики попаданий и промахов кэша страниц."""
+    keys = {
+        PAGE_STATS_KEY.format(event): event for event in ('hits', 'misses')
+    }
+    stored = cache.get_many(keys)
+    return {event: stored.get(key, 0) for key, event in keys.items()}
+
+
+def reset_page_cache_stats():
+    """Обнулить счётчики кэша страниц."""
+    cache.delete_many([
+        PAGE_STATS_KEY.format(event) for event in ('hits', 'misses')
+    ])
+
+
+def _card_key(post, versions):
+    related = ':'.join(
+        str(versions[tag]) for tag in post_tags(post) if tag in versions
+    )
+    return CARD_KEY.format(
+        f'{post.pk}:{post.updated_at.timestamp()}:{post.comment_count}:'
+        f'{related}'
+    )
+
+
+def render_post_cards(posts):
+    """Вернуть отрисованные карточки публикаций, используя кэш.
+
+    Ключ карточки состоит из id, updated_at и числа комментариев
+    публикации, а также версий меток её автора, категории и
+    местоположения, поэтому устаревшие карточки не удаляются, а просто
+    перестают запрашиваться. Все карточки страницы читаются одним
+    get_many.
+    """
+    posts = list(posts)
+    if not settings.POST_CARD_CACHE_TIMEOUT:
+        return [_render_post_card(post) for post in posts]
+    versions = get_tag_versions({
+        tag for post in posts for tag in post_tags(post)
+        if not tag.startswith('post:')
+    })
+    keys = [_card_key(post, versions) for post in posts]
+    cards = cache.get_many(keys)
+    missing = {
+        key: _render_post_card(post)
+        for key, post in zip(keys, posts) if key not in cards
+    }
+    cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+    cards.update(missing)
+    return [mark_safe(cards[key]) for key in keys]
+
+
+def _render_post_card(post):
+    return render_to_string('includes/post_card.html', {'post': post})
+
+
+def get_feed_count(name, tags, counter):
+    """Вернуть количество публикаций ленты и признак точности.
+
+    Точное значение хранится вместе с версиями меток ленты. Если метки
+    изменились, но значению меньше FEED_COUNT_MAX_STALENESS секунд, оно
+    возвращается как оценка, поэтому при частых изменениях COUNT(*)
+    выполняется не чаще раза в этот интервал.
+    """
+    entry = cache.get(COUNT_KEY.format(name))
+    versions = get_tag_versions(tags)
+    if entry is not None:
+        if entry['tags'] == versions:
+            return entry['count'], True
+        age = time.time() - entry['counted_at']
+        if age < settings.FEED_COUNT_MAX_STALENESS:
+            return entry['count'], False
+    return store_feed_count(name, versions, counter()), True
+
+
+def store_feed_count(name, versions, count):
+    """Сохранить точное количество публикаций ленты."""
+    cache.set(
+        COUNT_KEY.format(name),
+        {'count': count, 'tags': versions, 'counted_at': time.time()},
+        settings.FEED_COUNT_TIMEOUT,
+    )
+    return count
@@ -0,0 +1,215 @@
+"""Модуль с вариантами изображений публикаций разной ширины."""
+from concurrent.futures import as_completed
+from datetime import timedelta
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from blogicum.constants import IMAGE_VARIANT_QUALITY, IMAGE_VARIANT_WIDTHS
+
+from .cache import invalidate_tags
+from .models import ImageJob, Post
+from .utils import claim_due
+
+VARIANTS_DIR = 'variants'
+# Ширина изображения на странице: карточка шириной 40rem или весь экран.
+IMAGE_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+
+def variants_ready(post):
+    """Проверить, что варианты созданы для текущего изображения."""
+    return bool(
+        post.image
+        and post.image_variants.get('source') == post.image.name
+    )
+
+
+def build_image_variants(name, storage=default_storage):
+    """Создать варианты изображения и вернуть их описание.
+
+    Для каждой ширины из IMAGE_VARIANT_WIDTHS меньше исходной
+    создаются копии в исходном формате (JPEG, или PNG для изображений
+    с прозрачностью) и в WebP; WebP создаётся и в исходной ширине.
+    Описание сохраняется в Post.image_variants. Функция не обращается
+    к БД, поэтому выполняется и в процессах пула process_image_jobs.
+    """
+    with storage.open(name, 'rb') as stream:
+        picture = ImageOps.exif_transpose(Image.open(stream))
+        picture.load()
+    width, height = picture.size
+    transparent = (
+        picture.mode in ('RGBA', 'LA', 'PA')
+        or 'transparency' in picture.info
+    )
+    fallback, extension = ('PNG', '.png') if transparent else ('JPEG', '.jpg')
+    picture = picture.convert('RGBA' if transparent else 'RGB')
+    stem = PurePosixPath(name)
+    directory = stem.parent / VARIANTS_DIR
+
+    def save(size, image_format, suffix):
+        variant_height = round(height * size / width)
+        resized = (
+            picture if size == width
+            else picture.resize(
+                (size, variant_height), Image.Resampling.LANCZOS
+            )
+        )
+        buffer = BytesIO()
+        resized.save(
+            buffer, image_format, quality=IMAGE_VARIANT_QUALITY,
+            optimize=True,
+        )
+        name = storage.save(
+            str(directory / f'{stem.stem}-{size}{suffix}'),
+            ContentFile(buffer.getvalue()),
+        )
+        return [size, name]
+
+    sizes = [size for size in IMAGE_VARIANT_WIDTHS if size < width]
+    return {
+        'source': name,
+        'width': width,
+        'height': height,
+        'fallback': [save(size, fallback, extension) for size in sizes],
+        'webp': [save(size, 'WEBP', '.webp') for size in [*sizes, width]],
+    }
+
+
+def delete_image_variants(storage, variants):
+    """Удалить файлы вариантов изображения."""
+    for _, name in [
+        *variants.get('fallback', ()), *variants.get('webp', ())
+    ]:
+        storage.delete(name)
+
+
+def store_image_variants(post, variants):
+    """Сохранить описание вариантов и сбросить кэш страниц публикации.
+
+    Старые варианты удаляются. Сохранение идёт через update(), без
+    сигналов, но с новым updated_at, чтобы обновились карточки.
+    """
+    if post.image_variants:
+        delete_image_variants(post.image.storage, post.image_variants)
+    now = timezone.now()
+    Post.objects.filter(pk=post.pk).update(
+        image_variants=variants, updated_at=now
+    )
+    post.image_variants = variants
+    post.updated_at = now
+    invalidate_tags(f'post:{post.pk}')
+
+
+def queue_image_job(post):
+    """Поставить в очередь создание вариантов изображения публикации.
+
+    Если изображение убрали, описание вариантов очищается сразу; оно
+    читается из БД, так как Post.save() его не записывает и у экземпляра
+    оно может быть устаревшим. Ещё не начатое задание публикации
+    переиспользуется.
+    """
+    if not post.image:
+        post.image_variants = Post.objects.filter(pk=post.pk).values_list(
+            'image_variants', flat=True
+        ).first() or {}
+        if post.image_variants:
+            store_image_variants(post, {})
+        return None
+    if variants_ready(post):
+        return None
+    job = ImageJob.objects.filter(
+        post=post, attempts=0, next_attempt_at__isnull=False
+    ).first()
+    if job is None:
+        return ImageJob.objects.create(post=post, source=post.image.name)
+    job.source = post.image.name
+    job.next_attempt_at = timezone.now()
+    job.save(update_fields=('source', 'next_attempt_at'))
+    return job
+
+
+def retry_delay(attempts):
+    """Вернуть паузу перед следующей попыткой (экспоненциально)."""
+    return timedelta(
+        seconds=settings.IMAGE_JOB_RETRY_BASE * 2 ** (attempts - 1)
+    )
+
+
+class ImageJobRunner:
+    """Исполнитель заданий ImageJob в пуле процессов.
+
+    Декодирование и сжатие изображений нагружают процессор и держат
+    GIL, поэтому выполняются в ProcessPoolExecutor параллельно по
+    ядрам. Процессы пула работают только с хранилищем файлов; задания
+    выбирает и результаты сохраняет основной процесс. Выбранные
+    задания закрепляются на lease секунд, как письма в OutboxSender.
+
+    Атрибуты класса:
+    - batch_size: Наибольшее количество заданий в пачке.
+    - lease: На сколько секунд пачка закрепляется за исполнителем.
+    """
+
+    batch_size = 20
+    lease = 600
+
+    def __init__(self, executor, batch_size=None, lease=None):
+        self.executor = executor
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if lease is not None:
+            self.lease = lease
+        self.done = 0
+        self.stale = 0
+        self.retried = 0
+        self.failed = 0
+
+    def claim(self):
+        """Выбрать пачку наступивших заданий и закрепить её за собой."""
+        return claim_due(ImageJob, self.batch_size, self.lease)
+
+    def run_batch(self):
+        """Выполнить одну пачку; вернуть количество заданий в ней."""
+        batch = self.claim()
+        futures = {
+            self.executor.submit(build_image_variants, job.source): job
+            for job in batch
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                self.finish(job, future.result())
+            except Exception as error:
+                self.fail(job, error)
+        ImageJob.objects.bulk_update(
+            batch, ('attempts', 'next_attempt_at', 'finished_at', 'last_error')
+        )
+        return len(batch)
+
+    def finish(self, job, variants):
+        post = Post.objects.filter(pk=job.post_id).only(
+            'image', 'image_variants'
+        ).first()
+        if post is None or post.image.name != job.source:
+            # Изображение успели заменить: варианты больше не нужны.
+            delete_image_variants(default_storage, variants)
+            self.stale += 1
+        else:
+            store_image_variants(post, variants)
+            self.done += 1
+        job.next_attempt_at = None
+        job.finished_at = timezone.now()
+        job.last_error = ''
+
+    def fail(self, job, error):
+        job.last_error = f'{type(error).__name__}: {error}'
+        if job.attempts >= settings.IMAGE_JOB_MAX_ATTEMPTS:
+            job.next_attempt_at = None
+            self.failed += 1
+        else:
+            job.next_attempt_at = timezone.now() + retry_delay(job.attempts)
+            self.retried += 1
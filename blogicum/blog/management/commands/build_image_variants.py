@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import (
+    build_image_variants, store_image_variants, variants_ready
+)
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """Создание вариантов изображений уже сохранённых публикаций."""
+
+    help = (
+        'Создаёт уменьшенные копии и WebP для изображений публикаций, '
+        'у которых их ещё нет (или для всех с --force), сразу, минуя '
+        'очередь process_image_jobs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать варианты и для готовых изображений.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        created = skipped = failed = 0
+        last_pk = 0
+        while True:
+            # Порции по первичному ключу: записи в ту же таблицу
+            # во время чтения курсором SQLite не допускает.
+            batch = list(
+                Post.objects.exclude(image='').filter(pk__gt=last_pk)
+                .only('image', 'image_variants')
+                .order_by('pk')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for post in batch:
+                if variants_ready(post) and not options['force']:
+                    skipped += 1
+                    continue
+                try:
+                    store_image_variants(
+                        post, build_image_variants(
+                            post.image.name, post.image.storage
+                        )
+                    )
+                except OSError as error:
+                    failed += 1
+                    self.stderr.write(f'Публикация {post.pk}: {error}')
+                    continue
+                created += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: {created}, пропущено: {skipped}, ошибок: {failed}.'
+        ))
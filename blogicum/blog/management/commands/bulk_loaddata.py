@@ -0,0 +1,206 @@
+import gzip
+import json
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.utils import (
+    bulk_insert_raw, recount_comments, refresh_post_visibility
+)
+
+DEFAULT_MODELS = (
+    'blog.category', 'blog.location', 'auth.user', 'blog.post', 'blog.comment'
+)
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Читать объекты JSON-массива по одному, не загружая файл целиком."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != '[':
+                raise DeserializationError('Ожидался JSON-массив.')
+            started = True
+            position += 1
+            continue
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise DeserializationError('Файл оборван или повреждён.')
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item
+        position = end
+
+
+class Command(BaseCommand):
+    """Быстрая потоковая загрузка фикстуры в формате dumpdata."""
+
+    help = (
+        'Загружает JSON-фикстуру (например, db.json) потоково, пачками '
+        'INSERT по моделям в порядке зависимостей, без сигналов. '
+        'Денормализованные поля публикаций пересчитываются после загрузки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к .json или .json.gz.')
+        parser.add_argument(
+            '--models', nargs='+', default=DEFAULT_MODELS,
+            help=(
+                'Загружаемые модели в порядке зависимостей, остальные '
+                'объекты пропускаются.'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--defer-indexes', action='store_true',
+            help='Удалить Meta.indexes моделей на время загрузки.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        try:
+            self.models = [
+                apps.get_model(label) for label in options['models']
+            ]
+        except (LookupError, ValueError) as error:
+            raise CommandError(error)
+        self.labels = {model._meta.label_lower for model in self.models}
+        self.batch_size = options['batch_size']
+        self.connection = connections[options['database']]
+        self.using = options['database']
+        self.buffers = defaultdict(list)
+        self.counts = defaultdict(int)
+        self.skipped = 0
+
+        opener = gzip.open if options['fixture'].endswith('.gz') else open
+        started = time.perf_counter()
+        with opener(options['fixture'], 'rt', encoding='utf-8') as stream:
+            with self.connection.constraint_checks_disabled():
+                with transaction.atomic(using=self.using):
+                    deferred = self.drop_indexes(options['defer_indexes'])
+                    self.load(stream)
+                    self.create_indexes(deferred)
+                    self.finish()
+        elapsed = time.perf_counter() - started
+
+        total = sum(self.counts.values())
+        for label, count in self.counts.items():
+            self.stdout.write(f'{label}: {count}')
+        if self.skipped:
+            self.stdout.write(f'Пропущено объектов: {self.skipped}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с).'
+        ))
+
+    def load(self, stream):
+        """Разложить объекты фикстуры по буферам моделей."""
+        for data in iter_json_array(stream):
+            if data.get('model', '').lower() not in self.labels:
+                self.skipped += 1
+                continue
+            for item in Deserializer([data], using=self.using):
+                model = type(item.object)
+                self.fill_auto_dates(item.object)
+                self.buffers[model].append(item.object)
+                for name, values in (item.m2m_data or {}).items():
+                    field = model._meta.get_field(name)
+                    through = field.remote_field.through
+                    self.buffers[through].extend(
+                        through(**{
+                            f'{field.m2m_field_name()}_id': item.object.pk,
+                            f'{field.m2m_reverse_field_name()}_id': value,
+                        })
+                        for value in values
+                    )
+                if len(self.buffers[model]) >= self.batch_size:
+                    self.flush(until=model)
+        self.flush()
+
+    @staticmethod
+    def fill_auto_dates(obj):
+        """Заполнить поля auto_now/auto_now_add, которых нет в фикстуре."""
+        for field in obj._meta.concrete_fields:
+            auto = getattr(field, 'auto_now', False) or getattr(
+                field, 'auto_now_add', False
+            )
+            if auto and getattr(obj, field.attname) is None:
+                field.pre_save(obj, add=True)
+
+    def flush(self, until=None):
+        """Записать буферы моделей, от которых зависит until, и её саму."""
+        for model in self.models:
+            self.flush_model(model)
+            if model is until:
+                return
+        for model in list(self.buffers):
+            self.flush_model(model)
+
+    def flush_model(self, model):
+        objects = self.buffers.pop(model, None)
+        if not objects:
+            return
+        bulk_insert_raw(model, objects, self.batch_size, self.using)
+        self.counts[model._meta.label_lower] += len(objects)
+        for field in model._meta.local_many_to_many:
+            self.flush_model(field.remote_field.through)
+
+    def drop_indexes(self, defer):
+        if not defer:
+            return []
+        deferred = [
+            (model, index)
+            for model in self.models for index in model._meta.indexes
+        ]
+        with self.connection.schema_editor(atomic=False) as editor:
+            for model, index in deferred:
+                editor.remove_index(model, index)
+        return deferred
+
+    def create_indexes(self, deferred):
+        if not deferred:
+            return
+        with self.connection.schema_editor(atomic=False) as editor:
+            for model, index in deferred:
+                editor.add_index(model, index)
+
+    def finish(self):
+        """Проверить связи и пересчитать то, что обычно делают save()."""
+        loaded = [
+            model for model in apps.get_models(include_auto_created=True)
+            if model._meta.label_lower in self.counts
+        ]
+        self.connection.check_constraints(
+            table_names=[model._meta.db_table for model in loaded]
+        )
+        sequence_sql = self.connection.ops.sequence_reset_sql(
+            no_style(), loaded
+        )
+        if sequence_sql:
+            with self.connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        refresh_post_visibility()
+        recount_comments()
+        # Сигналы при загрузке не отправлялись, метки кэша не сброшены.
+        cache.clear()
@@ -0,0 +1,101 @@
+import gzip
+import json
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Comment, Post
+
+EXPORTED_MODELS = (Post, Comment)
+
+
+def read_watermark(path):
+    """Вернуть сохранённые отметки выгрузки по моделям."""
+    if path is None or not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def write_watermark(path, watermark):
+    """Атомарно сохранить отметки выгрузки."""
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_text(json.dumps(watermark, indent=2), encoding='utf-8')
+    os.replace(temporary, path)
+
+
+def export_model(model, path, mark=None, chunk_size=2000):
+    """Выгрузить записи модели после отметки в сжатый JSONL.
+
+    Записи читаются по индексу (created_at, id) порциями через
+    iterator(), поэтому память не зависит от размера таблицы. Файл
+    появляется под своим именем только после полной записи.
+
+    Возвращает количество строк и новую отметку.
+    """
+    fields = [field.attname for field in model._meta.concrete_fields]
+    queryset = model._base_manager.order_by('created_at', 'id')
+    if mark:
+        created_at = parse_datetime(mark['created_at'])
+        queryset = queryset.filter(
+            Q(created_at__gt=created_at)
+            | Q(created_at=created_at, id__gt=mark['id'])
+        )
+    count = 0
+    temporary = path.with_name(path.name + '.tmp')
+    with gzip.open(temporary, 'wt', encoding='utf-8') as stream:
+        for row in queryset.values(*fields).iterator(chunk_size=chunk_size):
+            stream.write(json.dumps(
+                row, cls=DjangoJSONEncoder, ensure_ascii=False
+            ))
+            stream.write('\n')
+            count += 1
+            # Без DjangoJSONEncoder: он округляет время до миллисекунд.
+            mark = {
+                'created_at': row['created_at'].isoformat(), 'id': row['id']
+            }
+    os.replace(temporary, path)
+    return count, mark
+
+
+class Command(BaseCommand):
+    """Выгрузка публикаций и комментариев в сжатый JSONL."""
+
+    help = (
+        'Потоково выгружает публикации и комментарии в файлы .jsonl.gz. '
+        'С --watermark выгружаются только записи, созданные после '
+        'прошлой выгрузки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Каталог для файлов выгрузки.')
+        parser.add_argument(
+            '--watermark',
+            help='Файл с отметками (created_at, id) прошлой выгрузки.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        watermark_path = (
+            Path(options['watermark']) if options['watermark'] else None
+        )
+        watermark = read_watermark(watermark_path)
+        stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+        for model in EXPORTED_MODELS:
+            label = model._meta.label_lower
+            path = output / f'{model._meta.model_name}-{stamp}.jsonl.gz'
+            count, mark = export_model(
+                model, path, watermark.get(label), options['chunk_size']
+            )
+            if mark:
+                watermark[label] = mark
+            self.stdout.write(f'{label}: {count} -> {path}')
+        if watermark_path is not None:
+            write_watermark(watermark_path, watermark)
+        self.stdout.write(self.style.SUCCESS('Выгрузка завершена.'))
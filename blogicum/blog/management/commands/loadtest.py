@@ -0,0 +1,397 @@
+import json
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Category, Comment, CommentNotification, Post, User
+from blogicum.constants import NUM_OF_POSTS
+
+# Маршрут: (вес по умолчанию, нужен ли вход, метод).
+ROUTES = {
+    'index': (30, False, 'GET'),
+    'category': (10, False, 'GET'),
+    'profile': (8, False, 'GET'),
+    'post_detail': (25, False, 'GET'),
+    'comments': (5, False, 'GET'),
+    'search': (5, False, 'GET'),
+    'about': (1, False, 'GET'),
+    'rules': (1, False, 'GET'),
+    'edit_profile': (1, True, 'GET'),
+    'create_post_form': (1, True, 'GET'),
+    'edit_post': (1, True, 'GET'),
+    'delete_post': (1, True, 'GET'),
+    'edit_comment': (1, True, 'GET'),
+    'delete_comment': (1, True, 'GET'),
+    'add_comment': (5, True, 'POST'),
+    'create_post': (1, True, 'POST'),
+}
+SAMPLE_SIZE = 1000
+SEARCH_WORDS = ('день', 'город', 'работа', 'лето', 'встреча')
+
+
+def percentile(ordered, fraction):
+    """Вернуть перцентиль отсортированного списка (ближайший ранг)."""
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def current_commit():
+    """Вернуть текущий коммит git или None."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Dataset:
+    """Выборка объектов базы, на которые направляются запросы."""
+
+    def __init__(self):
+        self.posts = list(
+            Post.post_objects.order_by('-pub_date')
+            .values_list('pk', flat=True)[:SAMPLE_SIZE]
+        )
+        self.categories = list(
+            Category.objects.filter(is_published=True)
+            .values_list('slug', flat=True)[:SAMPLE_SIZE]
+        )
+        self.authors = list(
+            User.objects.filter(posts__isnull=False).distinct()
+            .values_list('pk', flat=True)[:SAMPLE_SIZE]
+        )
+        if not (self.posts and self.categories and self.authors):
+            raise CommandError(
+                'В базе нет опубликованных публикаций; заполните её, '
+                'например командой seed_blog.'
+            )
+        self.index_pages = min(5, -(-len(self.posts) // NUM_OF_POSTS))
+        self.usernames = dict(
+            User.objects.filter(pk__in=self.authors)
+            .values_list('pk', 'username')
+        )
+
+    def own_objects(self, user_id):
+        """Вернуть публикации и комментарии пользователя для правки."""
+        posts = list(
+            Post.objects.filter(author_id=user_id)
+            .values_list('pk', flat=True)[:SAMPLE_SIZE]
+        )
+        comments = list(
+            Comment.objects.filter(author_id=user_id)
+            .values_list('post_id', 'pk')[:SAMPLE_SIZE]
+        )
+        return posts, comments
+
+
+class Worker(threading.Thread):
+    """Поток, отправляющий запросы по смеси маршрутов."""
+
+    def __init__(self, number, dataset, mix, options, deadline, results):
+        super().__init__(name=f'loadtest-{number}')
+        self.rng = random.Random(
+            None if options['seed'] is None else options['seed'] + number
+        )
+        self.dataset = dataset
+        self.routes, self.weights = zip(*mix.items())
+        self.anonymous = options['anonymous']
+        self.requests = options['requests']
+        self.deadline = deadline
+        self.results = results
+        self.user_id = self.rng.choice(dataset.authors)
+        self.guest = Client(HTTP_HOST='localhost')
+        self.member = Client(HTTP_HOST='localhost')
+
+    def run(self):
+        try:
+            self.member.force_login(User.objects.get(pk=self.user_id))
+            self.own_posts, self.own_comments = self.dataset.own_objects(
+                self.user_id
+            )
+            sent = 0
+            while time.monotonic() < self.deadline and (
+                self.requests is None or sent < self.requests
+            ):
+                route = self.rng.choices(self.routes, self.weights)[0]
+                sent += self.send(route)
+        finally:
+            connections.close_all()
+
+    def send(self, route):
+        """Отправить запрос маршрута; вернуть False, если нечего слать."""
+        _, needs_login, method = ROUTES[route]
+        request = getattr(self, f'build_{route}')()
+        if request is None:
+            return False
+        url, data = request
+        client = self.member
+        if not needs_login and self.rng.random() < self.anonymous:
+            client = self.guest
+        started = time.perf_counter()
+        try:
+            if method == 'POST':
+                response = client.post(url, data)
+            else:
+                response = client.get(url, data)
+            failed = (
+                str(response.status_code)
+                if response.status_code >= 400 else None
+            )
+        except Exception as error:
+            failed = type(error).__name__
+        elapsed = time.perf_counter() - started
+        self.results.add(route, elapsed, failed)
+        return True
+
+    def build_index(self):
+        page = self.rng.randint(1, self.dataset.index_pages)
+        return reverse('blog:index'), {'page': page}
+
+    def build_category(self):
+        slug = self.rng.choice(self.dataset.categories)
+        return reverse('blog:category_posts', args=[slug]), {}
+
+    def build_profile(self):
+        username = self.dataset.usernames[
+            self.rng.choice(self.dataset.authors)
+        ]
+        return reverse('blog:profile', args=[username]), {}
+
+    def build_post_detail(self):
+        post_id = self.rng.choice(self.dataset.posts)
+        return reverse('blog:post_detail', args=[post_id]), {}
+
+    def build_comments(self):
+        post_id = self.rng.choice(self.dataset.posts)
+        return reverse('blog:comments', args=[post_id]), {}
+
+    def build_search(self):
+        return reverse('blog:search'), {'q': self.rng.choice(SEARCH_WORDS)}
+
+    def build_about(self):
+        return reverse('pages:about'), {}
+
+    def build_rules(self):
+        return reverse('pages:rules'), {}
+
+    def build_edit_profile(self):
+        username = self.dataset.usernames[self.user_id]
+        return reverse('blog:edit_profile', args=[username]), {}
+
+    def build_create_post_form(self):
+        return reverse('blog:create_post'), {}
+
+    def build_edit_post(self):
+        if self.own_posts:
+            post_id = self.rng.choice(self.own_posts)
+            return reverse('blog:edit_post', args=[post_id]), {}
+
+    def build_delete_post(self):
+        if self.own_posts:
+            post_id = self.rng.choice(self.own_posts)
+            return reverse('blog:delete_post', args=[post_id]), {}
+
+    def build_edit_comment(self):
+        if self.own_comments:
+            ids = self.rng.choice(self.own_comments)
+            return reverse('blog:edit_comment', args=ids), {}
+
+    def build_delete_comment(self):
+        if self.own_comments:
+            ids = self.rng.choice(self.own_comments)
+            return reverse('blog:delete_comment', args=ids), {}
+
+    def build_add_comment(self):
+        post_id = self.rng.choice(self.dataset.posts)
+        return (
+            reverse('blog:add_comment', args=[post_id]),
+            {'text': 'Комментарий нагрузочного теста'},
+        )
+
+    def build_create_post(self):
+        return reverse('blog:create_post'), {
+            'title': 'Публикация нагрузочного теста',
+            'text': 'Текст публикации нагрузочного теста.',
+            'pub_date': timezone.now().strftime('%Y-%m-%d %H:%M'),
+            'category': Category.objects.filter(
+                slug=self.rng.choice(self.dataset.categories)
+            ).values_list('pk', flat=True).first(),
+            'is_published': 'on',
+        }
+
+
+class Results:
+    """Потокобезопасный сбор длительностей запросов по маршрутам."""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.lock = threading.Lock()
+
+    def add(self, route, elapsed, failed):
+        """Учесть запрос; failed — код ответа или имя исключения."""
+        with self.lock:
+            self.timings[route].append(elapsed)
+            if failed:
+                self.errors[route][failed] += 1
+
+    def summary(self, duration):
+        routes = {}
+        failures = defaultdict(int)
+        for route, timings in sorted(self.timings.items()):
+            routes[route] = self.describe(
+                timings, self.errors[route], duration
+            )
+            for reason, count in self.errors[route].items():
+                failures[reason] += count
+        everything = [
+            timing for timings in self.timings.values() for timing in timings
+        ]
+        return routes, self.describe(everything, failures, duration)
+
+    @staticmethod
+    def describe(timings, failures, duration):
+        ordered = sorted(timings)
+
+        def milliseconds(fraction):
+            value = percentile(ordered, fraction)
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            'requests': len(ordered),
+            'errors': sum(failures.values()),
+            'failures': dict(failures),
+            'rps': round(len(ordered) / duration, 2) if duration else None,
+            'p50_ms': milliseconds(0.50),
+            'p95_ms': milliseconds(0.95),
+            'p99_ms': milliseconds(0.99),
+        }
+
+
+class Command(BaseCommand):
+    """Нагрузочный тест маршрутов блога и статических страниц."""
+
+    help = (
+        'Отправляет смесь запросов ко всем маршрутам blog и pages через '
+        'WSGI-обработчик из нескольких потоков и выводит пропускную '
+        'способность и p50/p95/p99 по маршрутам. Запросы на запись '
+        'создают реальные комментарии и публикации в текущей базе; '
+        'уведомления о комментариях, поставленные в очередь за время '
+        'теста, после него удаляются и не отправляются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument(
+            '--duration', type=float, default=30.0,
+            help='Длительность теста в секундах.',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=None,
+            help='Ограничить количество запросов на поток.',
+        )
+        parser.add_argument(
+            '--anonymous', type=float, default=0.7,
+            help='Доля анонимных запросов среди маршрутов без входа.',
+        )
+        parser.add_argument(
+            '--mix',
+            help=(
+                'JSON-файл с весами маршрутов, например {"index": 10}; '
+                'не указанные маршруты получают вес 0.'
+            ),
+        )
+        parser.add_argument(
+            '--read-only', action='store_true',
+            help='Не отправлять запросы на запись.',
+        )
+        parser.add_argument('--output', help='Файл для результатов в JSON.')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        mix = self.get_mix(options)
+        dataset = Dataset()
+        results = Results()
+        started = time.monotonic()
+        workers = [
+            Worker(
+                number, dataset, mix, options,
+                started + options['duration'], results,
+            )
+            for number in range(options['workers'])
+        ]
+        last_notification = CommentNotification.objects.aggregate(
+            last=Max('pk')
+        )['last'] or 0
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        duration = time.monotonic() - started
+        # Комментарии теста ставят письма в очередь (CommentNotification);
+        # удаляем их, чтобы send_notifications их не отправил.
+        CommentNotification.objects.filter(
+            pk__gt=last_notification,
+            comment__author_id__in=[worker.user_id for worker in workers],
+        ).delete()
+        routes, total = results.summary(duration)
+
+        for route, stats in routes.items():
+            self.stdout.write(self.format_line(route, stats))
+        self.stdout.write(self.style.SUCCESS(self.format_line('total', total)))
+        if options['output']:
+            report = {
+                'commit': current_commit(),
+                'started_at': timezone.now().isoformat(),
+                'duration': round(duration, 3),
+                'workers': options['workers'],
+                'anonymous': options['anonymous'],
+                'mix': mix,
+                'routes': routes,
+                'total': total,
+            }
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                json.dump(report, stream, ensure_ascii=False, indent=2)
+
+    def get_mix(self, options):
+        if options['mix']:
+            with open(options['mix'], encoding='utf-8') as stream:
+                mix = json.load(stream)
+            unknown = set(mix) - set(ROUTES)
+            if unknown:
+                raise CommandError(
+                    f'Неизвестные маршруты: {", ".join(sorted(unknown))}.'
+                )
+        else:
+            mix = {route: weight for route, (weight, *_) in ROUTES.items()}
+        if options['read_only']:
+            mix = {
+                route: weight for route, weight in mix.items()
+                if ROUTES[route][2] == 'GET'
+            }
+        mix = {route: weight for route, weight in mix.items() if weight > 0}
+        if not mix:
+            raise CommandError('В смеси нет ни одного маршрута.')
+        return mix
+
+    @staticmethod
+    def format_line(route, stats):
+        return (
+            f'{route:<18} {stats["requests"]:>7} запр. '
+            f'{stats["rps"]:>8} запр./с  ошибок {stats["errors"]:<5} '
+            f'p50 {stats["p50_ms"]} мс  p95 {stats["p95_ms"]} мс  '
+            f'p99 {stats["p99_ms"]} мс'
+        )
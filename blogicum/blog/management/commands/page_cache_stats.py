@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.cache import get_page_cache_stats, reset_page_cache_stats
+
+
+class Command(BaseCommand):
+    """Статистика кэша страниц для анонимных посетителей."""
+
+    help = (
+        'Выводит счётчики попаданий и промахов кэша страниц. Счётчики '
+        'ведутся только при PAGE_CACHE_STATS = True.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Обнулить счётчики после вывода.',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.PAGE_CACHE_STATS:
+            self.stderr.write(
+                'Счётчики выключены: включите PAGE_CACHE_STATS.'
+            )
+        stats = get_page_cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f'Попаданий: {stats["hits"]}, промахов: {stats["misses"]}, '
+            f'доля попаданий: {ratio:.1%}'
+        )
+        if options['reset']:
+            reset_page_cache_stats()
@@ -0,0 +1,75 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from blog.images import ImageJobRunner
+
+
+class Command(BaseCommand):
+    """Обработка изображений публикаций в пуле процессов."""
+
+    help = (
+        'Выполняет задания на создание вариантов изображений публикаций '
+        'параллельно в нескольких процессах. Пока задание не выполнено, '
+        'страницы показывают исходное изображение.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить наступившие задания и завершиться (cron).',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Количество процессов пула, по умолчанию по числу ядер.',
+        )
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.',
+        )
+        parser.add_argument(
+            '--lease',
+            type=float,
+            default=600,
+            help='На сколько секунд пачка закрепляется за исполнителем.',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=options['workers'], initializer=django.setup
+        ) as executor:
+            runner = ImageJobRunner(
+                executor,
+                batch_size=options['batch_size'] or options['workers'] * 4,
+                lease=options['lease'],
+            )
+            try:
+                while True:
+                    try:
+                        if runner.run_batch():
+                            continue
+                    except OperationalError as error:
+                        # Незавершённые задания вернутся в очередь по
+                        # истечении аренды.
+                        self.stderr.write(f'Ошибка базы данных: {error}.')
+                    if options['once']:
+                        break
+                    connection.close_if_unusable_or_obsolete()
+                    time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                pass
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено {runner.done}, устарело {runner.stale}, '
+            f'повторов {runner.retried}, отказов {runner.failed} '
+            f'за {elapsed:.1f} с.'
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blog.utils import rebuild_post_search
+
+
+class Command(BaseCommand):
+    """Перестроение полнотекстового индекса публикаций."""
+
+    help = (
+        'Заново заполняет индекс FTS5 по заголовкам и текстам публикаций '
+        'и оптимизирует его.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(
+                'Полнотекстовый индекс FTS5 поддерживается только в SQLite.'
+            )
+        rebuild_post_search()
+        self.stdout.write(self.style.SUCCESS('Индекс поиска перестроен.'))
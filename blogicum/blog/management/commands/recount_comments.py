@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.utils import get_comment_count_mismatches, recount_comments
+
+
+class Command(BaseCommand):
+    """Пересчёт денормализованных счётчиков комментариев публикаций."""
+
+    help = 'Пересчитывает поле Post.comment_count по таблице комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, ничего не изменяя.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = get_comment_count_mismatches().values_list(
+                'pk', 'comment_count', 'actual_count'
+            )
+            for pk, stored, actual in mismatches:
+                self.stdout.write(
+                    f'Пост {pk}: сохранено {stored}, на самом деле {actual}'
+                )
+            if mismatches:
+                raise CommandError(
+                    f'Найдено расхождений: {len(mismatches)}.'
+                )
+            self.stdout.write(self.style.SUCCESS('Счётчики корректны.'))
+            return
+        fixed = recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}.')
+        )
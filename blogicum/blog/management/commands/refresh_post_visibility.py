@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.utils import refresh_post_visibility
+
+
+class Command(BaseCommand):
+    """Пересчёт признака видимости публикаций."""
+
+    help = (
+        'Пересчитывает поле Post.is_visible по статусу публикаций '
+        'и их категорий.'
+    )
+
+    def handle(self, *args, **options):
+        processed = refresh_post_visibility()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано публикаций: {processed}.')
+        )
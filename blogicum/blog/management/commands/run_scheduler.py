@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.scheduler import PublicationScheduler
+
+
+class Command(BaseCommand):
+    """Рассылка событий о выходе отложенных публикаций."""
+
+    help = (
+        'Следит за отложенными публикациями и сбрасывает кэш лент '
+        'в момент наступления их pub_date.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать наступившие публикации и завершиться (cron).',
+        )
+        parser.add_argument(
+            '--reload-interval',
+            type=float,
+            default=60,
+            help='Как часто перечитывать публикации из БД, в секундах.',
+        )
+        parser.add_argument(
+            '--horizon',
+            type=float,
+            default=3600,
+            help='На сколько секунд вперёд загружать публикации в кучу.',
+        )
+
+    def handle(self, *args, **options):
+        reload_interval = options['reload_interval']
+        scheduler = PublicationScheduler(
+            horizon=timedelta(seconds=max(
+                options['horizon'], reload_interval
+            ))
+        )
+        scheduler.load()
+        if options['once']:
+            self.report(scheduler.run_pending())
+            return
+        reload_at = time.monotonic() + reload_interval
+        while True:
+            self.report(scheduler.run_pending())
+            if time.monotonic() >= reload_at:
+                scheduler.load()
+                reload_at = time.monotonic() + reload_interval
+                continue
+            wait = reload_at - time.monotonic()
+            until_next = scheduler.seconds_until_next()
+            if until_next is not None:
+                wait = min(wait, until_next)
+            time.sleep(max(wait, 0))
+
+    def report(self, posts):
+        for post in posts:
+            self.stdout.write(
+                f'{timezone.now():%Y-%m-%d %H:%M:%S} '
+                f'Опубликован пост {post.pk}: {post.title}'
+            )
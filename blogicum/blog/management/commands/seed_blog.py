@@ -0,0 +1,291 @@
+import random
+import time
+from array import array
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from blog.models import Category, Comment, Location, Post, User
+from blog.utils import bulk_insert_raw
+from blogicum.constants import MAX_LENGTH_CHAR
+
+POOL_SIZE = 1000
+DAY = 24 * 60 * 60
+
+
+def power_law_cum_weights(size, exponent, rng):
+    """Вернуть накопленные веса степенного закона в случайном порядке."""
+    weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+    rng.shuffle(weights)
+    return list(accumulate(weights))
+
+
+def next_id(model):
+    """Вернуть первый свободный первичный ключ модели."""
+    return (model._base_manager.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+class Command(BaseCommand):
+    """Генерация синтетических данных для нагрузочного тестирования."""
+
+    help = (
+        'Заполняет базу пользователями, категориями, местоположениями, '
+        'публикациями и комментариями пачками bulk INSERT. Даты публикаций '
+        'смещены к настоящему времени, часть публикаций отложена, '
+        'комментарии и авторство распределены по степенному закону.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=1000000)
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='Глубина истории публикаций в днях.',
+        )
+        parser.add_argument(
+            '--scheduled', type=float, default=0.02,
+            help='Доля отложенных публикаций с датой в будущем.',
+        )
+        parser.add_argument(
+            '--unpublished', type=float, default=0.03,
+            help='Доля снятых с публикации публикаций.',
+        )
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель степенного закона для авторов и комментариев.',
+        )
+        parser.add_argument(
+            '--password', default=None,
+            help='Пароль всех пользователей, по умолчанию вход отключён.',
+        )
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--locale', default='ru_RU')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.make_pools(options['locale'], options['seed'])
+        started = time.perf_counter()
+        with transaction.atomic():
+            users = self.create_users()
+            categories = self.create_categories()
+            locations = self.create_locations()
+            posts = self.plan_posts()
+            counts = self.plan_comments(posts)
+            post_ids = self.create_posts(
+                posts, counts, users, categories, locations
+            )
+            self.create_comments(posts, counts, post_ids, users)
+        # Сигналы не отправлялись, поэтому метки кэша не сброшены.
+        cache.clear()
+        elapsed = time.perf_counter() - started
+        total = sum(self.created.values())
+        for label, count in self.created.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано строк: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с).'
+        ))
+
+    def make_pools(self, locale, seed):
+        """Заранее сгенерировать тексты: Faker медленный для миллионов."""
+        fake = Faker(locale)
+        fake.seed_instance(seed)
+        self.titles = [
+            fake.sentence(nb_words=5)[:MAX_LENGTH_CHAR]
+            for _ in range(POOL_SIZE)
+        ]
+        self.texts = [fake.paragraph(nb_sentences=8) for _ in range(POOL_SIZE)]
+        self.comments = [
+            fake.sentence(nb_words=12) for _ in range(POOL_SIZE)
+        ]
+        self.places = [
+            fake.city()[:MAX_LENGTH_CHAR] for _ in range(POOL_SIZE)
+        ]
+        self.usernames = [fake.user_name() for _ in range(POOL_SIZE)]
+        self.created = {}
+
+    def insert(self, model, objects):
+        """Вставить объекты пачками и учесть их в отчёте."""
+        batch_size = self.options['batch_size']
+        batch = []
+        total = 0
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                bulk_insert_raw(model, batch, batch_size)
+                total += len(batch)
+                batch = []
+        if batch:
+            bulk_insert_raw(model, batch, batch_size)
+            total += len(batch)
+        self.created[model._meta.label_lower] = total
+
+    def insert_range(self, model, count, build):
+        """Создать count объектов с явными ключами и вернуть эти ключи."""
+        start = next_id(model)
+        ids = range(start, start + count)
+        self.insert(model, map(build, ids))
+        return ids
+
+    def create_users(self):
+        password = make_password(self.options['password'])
+
+        def build(pk):
+            username = f'{self.rng.choice(self.usernames)}_{pk}'
+            return User(
+                pk=pk,
+                username=username,
+                email=f'{username}@example.com',
+                password=password,
+                date_joined=self.now - timedelta(
+                    seconds=self.rng.uniform(0, self.options['days'] * DAY)
+                ),
+            )
+
+        return self.insert_range(User, self.options['users'], build)
+
+    def create_categories(self):
+        def build(pk):
+            return Category(
+                pk=pk,
+                title=self.rng.choice(self.titles),
+                description=self.rng.choice(self.texts),
+                slug=f'seed-{pk}',
+                created_at=self.now,
+            )
+
+        return self.insert_range(
+            Category, self.options['categories'], build
+        )
+
+    def create_locations(self):
+        def build(pk):
+            return Location(
+                pk=pk, name=self.rng.choice(self.places), created_at=self.now
+            )
+
+        return self.insert_range(Location, self.options['locations'], build)
+
+    def plan_posts(self):
+        """Выбрать даты и статус публикаций.
+
+        Даты смещены к настоящему времени (экспоненциально), доля
+        --scheduled уходит в будущее на срок до 30 дней. Для видимых
+        сейчас публикаций хранится неотрицательная метка времени, для
+        остальных — отрицательная.
+        """
+        span = self.options['days'] * DAY
+        now = self.now.timestamp()
+        planned = array('d')
+        for _ in range(self.options['posts']):
+            roll = self.rng.random()
+            if roll < self.options['scheduled']:
+                planned.append(-(now + self.rng.uniform(60, 30 * DAY)))
+                continue
+            moment = now - min(self.rng.expovariate(5 / span), span)
+            if roll < self.options['scheduled'] + self.options['unpublished']:
+                planned.append(-moment)
+            else:
+                planned.append(moment)
+        return planned
+
+    def plan_comments(self, posts):
+        """Распределить комментарии по видимым публикациям.
+
+        Количество комментариев у публикации подчиняется степенному
+        закону: немногие публикации собирают большую часть обсуждений.
+        """
+        counts = array('L', bytes(array('L').itemsize * len(posts)))
+        visible = [index for index, moment in enumerate(posts) if moment > 0]
+        if not visible:
+            return counts
+        cum_weights = power_law_cum_weights(
+            len(visible), self.options['skew'], self.rng
+        )
+        remaining = self.options['comments']
+        while remaining:
+            size = min(remaining, self.options['batch_size'])
+            for position in self.rng.choices(
+                range(len(visible)), cum_weights=cum_weights, k=size
+            ):
+                counts[visible[position]] += 1
+            remaining -= size
+        return counts
+
+    def pick_authors(self, users):
+        cum_weights = power_law_cum_weights(
+            len(users), self.options['skew'], self.rng
+        )
+        while True:
+            yield from self.rng.choices(
+                users, cum_weights=cum_weights, k=self.options['batch_size']
+            )
+
+    def create_posts(self, posts, counts, users, categories, locations):
+        authors = self.pick_authors(users)
+        start = next_id(Post)
+
+        def build(index):
+            moment = posts[index]
+            pub_date = self.from_timestamp(abs(moment))
+            created_at = min(pub_date, self.now)
+            is_published = moment > 0 or pub_date > self.now
+            return Post(
+                pk=start + index,
+                title=self.rng.choice(self.titles),
+                text=self.rng.choice(self.texts),
+                pub_date=pub_date,
+                author_id=next(authors),
+                category_id=self.rng.choice(categories),
+                location_id=(
+                    self.rng.choice(locations)
+                    if locations and self.rng.random() < 0.5 else None
+                ),
+                is_published=is_published,
+                is_visible=is_published,
+                comment_count=counts[index],
+                created_at=created_at,
+                updated_at=created_at,
+            )
+
+        self.insert(Post, map(build, range(len(posts))))
+        return range(start, start + len(posts))
+
+    def create_comments(self, posts, counts, post_ids, users):
+        authors = self.pick_authors(users)
+        now = self.now.timestamp()
+
+        def build():
+            pk = next_id(Comment)
+            for index, count in enumerate(counts):
+                moment = posts[index]
+                for _ in range(count):
+                    delay = self.rng.expovariate(1 / DAY)
+                    pk += 1
+                    yield Comment(
+                        pk=pk - 1,
+                        text=self.rng.choice(self.comments),
+                        post_id=post_ids[index],
+                        author_id=next(authors),
+                        created_at=self.from_timestamp(
+                            min(moment + delay, now)
+                        ),
+                    )
+
+        self.insert(Comment, build())
+
+    def from_timestamp(self, moment):
+        return self.now + timedelta(seconds=moment - self.now.timestamp())
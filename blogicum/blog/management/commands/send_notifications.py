@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from blog.notifications import OutboxSender
+
+
+class Command(BaseCommand):
+    """Отправка писем из очереди уведомлений о комментариях."""
+
+    help = (
+        'Отправляет накопившиеся уведомления о комментариях пачками через '
+        'одно соединение почтового бэкенда, повторяет неудачные отправки '
+        'с экспоненциальной задержкой и выводит скорость отправки. '
+        'Уведомления одной сводки (NOTIFICATION_DIGEST_WINDOW) '
+        'отправляются одним письмом.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить наступившие письма и завершиться (cron).',
+        )
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.',
+        )
+        parser.add_argument(
+            '--lease',
+            type=float,
+            default=300,
+            help='На сколько секунд пачка закрепляется за отправителем.',
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        sender = OutboxSender(
+            batch_size=options['batch_size'], lease=options['lease']
+        )
+        try:
+            while True:
+                try:
+                    sent = sender.send_batch()
+                except OperationalError as error:
+                    # Например, база заблокирована другим исполнителем:
+                    # незавершённая пачка вернётся в очередь по истечении
+                    # аренды.
+                    self.stderr.write(f'Ошибка базы данных: {error}.')
+                    sent = 0
+                if sent:
+                    self.report(sender)
+                elif options['once']:
+                    break
+                else:
+                    connection.close_if_unusable_or_obsolete()
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(self.summary(sender)))
+
+    def report(self, sender):
+        if self.verbosity > 1:
+            self.stdout.write(self.summary(sender))
+
+    @staticmethod
+    def summary(sender):
+        return (
+            f'Отправлено уведомлений {sender.sent} в {sender.messages} '
+            f'письмах, повторов {sender.retried}, отказов {sender.failed}, '
+            f'{sender.rate:.1f} уведомлений/с.'
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_comment_notification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='commentnotification',
+            index=models.Index(condition=models.Q(('attempts', 0)), fields=['recipient', 'next_attempt_at'], name='notification_digest_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:06
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+post_search = import_module('blog.migrations.0011_post_search')
+
+# SQLite добавляет поле, пересоздавая таблицу blog_post, и при этом
+# удаляет её триггеры; триггеры индекса поиска создаются заново.
+RECREATE_TRIGGERS_SQL = (
+    *post_search.DROP_SQL[:3],
+    *post_search.CREATE_SQL[1:],
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_notification_digest_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop,
+            post_search.run_on_sqlite(RECREATE_TRIGGERS_SQL),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Уменьшенные копии изображения; создаются автоматически.', verbose_name='Варианты изображения'),
+        ),
+        migrations.RunPython(
+            post_search.run_on_sqlite(RECREATE_TRIGGERS_SQL),
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_image_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Checkpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True, verbose_name='Задача')),
+                ('value', models.DateTimeField(verbose_name='Выполнено до')),
+            ],
+            options={
+                'verbose_name': 'отметка задачи',
+                'verbose_name_plural': 'Отметки задач',
+            },
+        ),
+    ]
@@ -1,14 +1,88 @@
 """Модуль с миксинами для модуля blog/views.py."""
+from functools import partial
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseForbidden
-from django.shortcuts import get_object_or_404, redirect
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponseForbidden
+from django.shortcuts import redirect
 from django.urls import reverse
 
+from blog.cache import get_cached_page, store_page
 from blog.forms import CommentForm, PostForm
 from blog.models import Comment, Post
+from blog.paginators import CachedCountPaginator, CursorPaginator
+from blog.write_queue import write
+from core.routers import replica_reads
+
+
+class AnonymousPageCacheMixin:
+    """Миксин кэширования страницы целиком для анонимных посетителей.
+
+    Запись кэша хранит версии меток страницы (см. blog/cache.py), и
+    обработчики сигналов сбрасывают только страницы, которых касается
+    изменение. Представление перечисляет метки в get_page_cache_tags().
+    Промах кэша отрисовывается из основной базы, даже если представление
+    читает с реплик (core.mixin.ReplicaReadMixin).
+    """
+
+    def get_page_cache_tags(self, context):
+        """Возвращает метки, от которых зависит страница."""
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        """Отдаёт страницу из кэша или кэширует отрисованную."""
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        path = request.get_full_path()
+        response = get_cached_page(path)
+        if response is not None:
+            return response
+        # Страница для кэша читается из основной базы: реплика может
+        # отставать от уже увеличенных версий меток, и устаревшая
+        # страница попала бы в кэш под новыми версиями.
+        with replica_reads(False):
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200 and hasattr(
+                response, 'add_post_render_callback'
+            ):
+                response['X-Page-Cache'] = 'miss'
+                response.add_post_render_callback(
+                    partial(self.store_rendered_page, path)
+                )
+                response.render()
+        return response
+
+    def store_rendered_page(self, path, response):
+        """Сохраняет отрисованную страницу, если она не ставит cookies."""
+        if not response.cookies:
+            store_page(
+                path, response,
+                self.get_page_cache_tags(response.context_data)
+            )
+
 
+class MemoizedObjectMixin:
+    """Миксин, запоминающий объект на время обработки запроса.
 
-class PostMixin(LoginRequiredMixin):
+    Экземпляр представления создаётся на каждый запрос, поэтому повторные
+    вызовы get_object() из dispatch, get/post и get_context_data
+    обходятся без новых запросов к БД.
+    """
+
+    def get_object(self, queryset=None):
+        """Возвращает объект, загружая его из БД один раз за запрос."""
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_memoized_object'):
+            self._memoized_object = super().get_object()
+        return self._memoized_object
+
+
+class PostMixin(MemoizedObjectMixin):
     """Миксин для создания/отображения/редактирования/удаления публикации.
 
     Атрибуты класса:
@@ -33,7 +107,7 @@ class PostChangeMixin(PostMixin):
 
     def dispatch(self, request, *args, **kwargs):
         """Проверяет, является ли пользователь автором публикации."""
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.pk:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs[self.pk_url_kwarg]
@@ -41,7 +115,7 @@ class PostChangeMixin(PostMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
-class CommentMixin(LoginRequiredMixin):
+class CommentMixin(MemoizedObjectMixin, LoginRequiredMixin):
     """Миксин для редактирования/удаления комментария.
 
     Атрибуты класса:
@@ -56,16 +130,9 @@ class CommentMixin(LoginRequiredMixin):
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
-    def get_object(self, queryset=None):
-        """Возвращает коммунтарий."""
-        return get_object_or_404(
-            Comment,
-            id=self.kwargs[self.pk_url_kwarg]
-        )
-
     def dispatch(self, request, *args, **kwargs):
         """Проверяет, является ли пользователь автором комментария."""
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.pk:
             return HttpResponseForbidden(
                 "Вы не являетесь автором данного комментария."
             )
@@ -74,3 +141,69 @@ class CommentMixin(LoginRequiredMixin):
     def get_success_url(self):
         """Возвращает URL перенаправления после edit/delete комментария."""
         return reverse('blog:post_detail', args=[self.kwargs['post_id']])
+
+
+class PaginationModeMixin:
+    """Миксин выбора режима пагинации списка публикаций.
+
+    Атрибуты класса:
+    - pagination_mode: 'numbered' (номера страниц) или 'cursor'
+      (по курсору); по умолчанию берётся из settings.POSTS_PAGINATION.
+    - cursor_ordering: Поля сортировки для пагинации по курсору.
+    - paginator_class: Пагинатор режима 'numbered' с «окном» номеров
+      и кэшированным количеством публикаций.
+    """
+
+    pagination_mode = None
+    paginator_class = CachedCountPaginator
+    cursor_ordering = ('-pub_date', '-id')
+
+    def get_pagination_mode(self):
+        """Возвращает режим пагинации."""
+        return self.pagination_mode or settings.POSTS_PAGINATION
+
+    def get_count_cache(self):
+        """Возвращает ключ и метки кэша количества публикаций ленты."""
+        return None, ()
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Возвращает пагинатор с кэшем количества публикаций."""
+        count_key, count_tags = self.get_count_cache()
+        return super().get_paginator(
+            queryset, per_page,
+            count_key=count_key, count_tags=count_tags, **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Разбивает список на страницы выбранным способом."""
+        if self.get_pagination_mode() != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset, page_size, ordering=self.cursor_ordering
+        )
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class WriteQueueMixin:
+    """Миксин сохранения формы через очередь записи.
+
+    Объект и изменения из обработчиков сигналов сохраняются в одной
+    транзакции; при WRITE_QUEUE_ENABLED её выполняет поток-писатель
+    (см. blog/write_queue.py).
+    """
+
+    def save_form(self, form):
+        """Сохраняет форму; выполняется в транзакции записи."""
+        return form.save()
+
+    def form_valid(self, form):
+        """Сохраняет форму и перенаправляет на страницу успеха."""
+        self.object = write(self.save_form, form)
+        return redirect(self.get_success_url())
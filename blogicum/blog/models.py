@@ -12,12 +12,15 @@ User = get_user_model()
 class PostManager(models.Manager):
     """Кастомный менеджер для модели Post."""
 
+    @staticmethod
+    def visible_filter():
+        """Возвращаем условие видимости публикации в ленте."""
+        return models.Q(pub_date__lte=timezone.now(), is_visible=True)
+
     def get_queryset(self):
         """Возвращаем результат запроса к таблице Post."""
         return super().get_queryset().filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True,
+            self.visible_filter()
         ).select_related('author', 'category', 'location')
 
 
@@ -96,17 +99,97 @@ class Post(PublishedModel, PublishedTitle):
         blank=True,
         verbose_name='Изображение',
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Варианты изображения',
+        help_text='Уменьшенные копии изображения; создаются автоматически.',
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено',
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Видна в ленте',
+        help_text=(
+            'Публикация и её категория опубликованы; '
+            'поддерживается автоматически.'
+        ),
+    )
 
     objects = models.Manager()
     post_objects = PostManager()
 
+    # Поля, которые поддерживаются через update(): счётчик комментариев
+    # (сигналы) и описание вариантов изображения (blog/images.py).
+    MAINTAINED_FIELDS = ('comment_count', 'image_variants')
+
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('created_at', 'id'),
+                name='post_created_export_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Пересчитывает признак видимости перед сохранением.
+
+        Поля из MAINTAINED_FIELDS изменяются только через update(), поэтому
+        при сохранении существующей публикации без update_fields они не
+        записываются: иначе экземпляр, загруженный раньше, затёр бы
+        их текущие значения.
+        """
+        self.is_visible = bool(
+            self.is_published
+            and self.category_id is not None
+            and self.category.is_published
+        )
+        update_fields = kwargs.get('update_fields')
+        if (
+            update_fields is None
+            and not self._state.adding
+            and self.pk is not None
+            and not kwargs.get('force_insert')
+        ):
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.MAINTAINED_FIELDS
+            ]
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель описывающая поля Комментарий."""
@@ -135,6 +218,159 @@ class Comment(models.Model):
         ordering = ('created_at',)
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_stream_idx',
+            ),
+            models.Index(
+                fields=('created_at', 'id'),
+                name='comment_created_export_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text
+
+
+class CommentNotification(models.Model):
+    """Модель письма автору публикации о новом комментарии (outbox).
+
+    Запись создаётся в транзакции комментария, а отправляет письмо
+    команда send_notifications. next_attempt_at — время следующей
+    попытки; пустое значение означает, что письмо отправлено или
+    попытки исчерпаны.
+    """
+
+    comment = models.ForeignKey(
+        Comment,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Комментарий',
+    )
+    recipient = models.EmailField(verbose_name='Получатель')
+    subject = models.CharField(
+        max_length=MAX_LENGTH_CHAR,
+        verbose_name='Тема',
+    )
+    message = models.TextField(verbose_name='Текст письма')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки',
+    )
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=timezone.now,
+        verbose_name='Следующая попытка',
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено',
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка',
+    )
+
+    class Meta:
+        ordering = ('created_at',)
+        verbose_name = 'уведомление о комментарии'
+        verbose_name_plural = 'Уведомления о комментариях'
+        indexes = (
+            models.Index(
+                fields=('next_attempt_at', 'id'),
+                condition=models.Q(next_attempt_at__isnull=False),
+                name='notification_pending_idx',
+            ),
+            models.Index(
+                fields=('recipient', 'next_attempt_at'),
+                condition=models.Q(attempts=0),
+                name='notification_digest_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class ImageJob(models.Model):
+    """Модель задания на создание вариантов изображения публикации.
+
+    Задание ставится в очередь при сохранении публикации с новым
+    изображением и выполняется командой process_image_jobs.
+    next_attempt_at — время следующей попытки; пустое значение
+    означает, что задание выполнено или попытки исчерпаны.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_jobs',
+        verbose_name='Публикация',
+    )
+    source = models.CharField(
+        max_length=MAX_LENGTH_CHAR,
+        verbose_name='Изображение',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток',
+    )
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=timezone.now,
+        verbose_name='Следующая попытка',
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Выполнено',
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка',
+    )
+
+    class Meta:
+        ordering = ('created_at',)
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        indexes = (
+            models.Index(
+                fields=('next_attempt_at', 'id'),
+                condition=models.Q(next_attempt_at__isnull=False),
+                name='image_job_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return self.source
+
+
+class Checkpoint(models.Model):
+    """Модель отметки фоновой задачи: до какого момента она выполнена."""
+
+    name = models.CharField(
+        max_length=MAX_LENGTH_SLUG,
+        unique=True,
+        verbose_name='Задача',
+    )
+    value = models.DateTimeField(verbose_name='Выполнено до')
+
+    class Meta:
+        verbose_name = 'отметка задачи'
+        verbose_name_plural = 'Отметки задач'
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
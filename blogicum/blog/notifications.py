@@ -0,0 +1,176 @@
+"""Модуль с очередью писем о новых комментариях (outbox)."""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import CommentNotification
+from .utils import claim_due
+
+
+def queue_comment_notification(comment, post_url):
+    """Поставить в очередь письмо автору публикации о комментарии.
+
+    Вызывается в транзакции сохранения комментария: письмо либо
+    сохраняется вместе с комментарием, либо не сохраняется вовсе.
+    При NOTIFICATION_DIGEST_WINDOW письмо откладывается до конца окна
+    сводки получателя (см. digest_time()).
+    """
+    post = comment.post
+    return CommentNotification.objects.create(
+        comment=comment,
+        recipient=post.author.email,
+        subject='New comment',
+        message=(
+            f'Пользователь {comment.author} оставил комментарий '
+            f'к публикации {post.title}.'
+            f'Читать комментарий {post_url}'
+        ),
+        next_attempt_at=digest_time(post.author.email),
+    )
+
+
+def digest_time(recipient):
+    """Вернуть время отправки нового письма получателю.
+
+    Первое письмо открывает окно сводки длиной
+    NOTIFICATION_DIGEST_WINDOW секунд, следующие письма получают то же
+    время и уходят вместе с ним одним сообщением.
+    """
+    now = timezone.now()
+    window = settings.NOTIFICATION_DIGEST_WINDOW
+    if not window:
+        return now
+    return CommentNotification.objects.filter(
+        recipient=recipient, attempts=0, next_attempt_at__gt=now
+    ).aggregate(
+        first=Min('next_attempt_at')
+    )['first'] or now + timedelta(seconds=window)
+
+
+def build_digest(notifications):
+    """Собрать одно письмо из уведомлений одного получателя."""
+    if len(notifications) == 1:
+        subject = notifications[0].subject
+        body = notifications[0].message
+    else:
+        subject = 'New comments'
+        body = '\n\n'.join(
+            [f'Новых комментариев: {len(notifications)}.']
+            + [notification.message for notification in notifications]
+        )
+    return EmailMessage(
+        subject=subject,
+        body=body,
+        from_email=settings.FROM_EMAIL,
+        to=[notifications[0].recipient],
+    )
+
+
+def retry_delay(attempts):
+    """Вернуть паузу перед следующей попыткой (экспоненциально)."""
+    return timedelta(seconds=min(
+        settings.NOTIFICATION_RETRY_BASE * 2 ** (attempts - 1),
+        settings.NOTIFICATION_RETRY_MAX,
+    ))
+
+
+class OutboxSender:
+    """Отправитель писем из очереди CommentNotification.
+
+    Письма выбираются пачками по индексу notification_pending_idx.
+    Выбранные записи сразу получают попытку и next_attempt_at через
+    lease секунд: если процесс упадёт посреди отправки, письма вернутся
+    в очередь по истечении этого срока, а второй отправитель их не
+    возьмёт. Вся пачка отправляется через одно соединение почтового
+    бэкенда; письма одного получателя с одним временем отправки
+    (сводка) уходят одним сообщением. После ошибки письмо повторяется
+    с экспоненциальной задержкой, пока не исчерпано
+    NOTIFICATION_MAX_ATTEMPTS попыток.
+
+    Атрибуты класса:
+    - batch_size: Наибольшее количество писем в пачке.
+    - lease: На сколько секунд пачка закрепляется за отправителем.
+    """
+
+    batch_size = 100
+    lease = 300
+
+    def __init__(self, batch_size=None, lease=None):
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if lease is not None:
+            self.lease = lease
+        self.sent = 0
+        self.messages = 0
+        self.retried = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        """Отправлено уведомлений в секунду."""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def claim(self):
+        """Выбрать пачку наступивших писем и закрепить её за собой."""
+        return claim_due(CommentNotification, self.batch_size, self.lease)
+
+    def send_batch(self):
+        """Отправить одну пачку; вернуть количество обработанных писем."""
+        batch = self.claim()
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        groups = {}
+        for notification in batch:
+            groups.setdefault(
+                (notification.recipient, notification.next_attempt_at), []
+            ).append(notification)
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as error:
+            for notifications in groups.values():
+                self.fail(notifications, error)
+        else:
+            try:
+                for notifications in groups.values():
+                    self.send(connection, notifications)
+            finally:
+                connection.close()
+        CommentNotification.objects.bulk_update(
+            batch,
+            ('attempts', 'next_attempt_at', 'sent_at', 'last_error'),
+        )
+        self.elapsed += time.perf_counter() - started
+        return len(batch)
+
+    def send(self, connection, notifications):
+        try:
+            connection.send_messages([build_digest(notifications)])
+        except Exception as error:
+            self.fail(notifications, error)
+            return
+        now = timezone.now()
+        for notification in notifications:
+            notification.sent_at = now
+            notification.next_attempt_at = None
+            notification.last_error = ''
+        self.sent += len(notifications)
+        self.messages += 1
+
+    def fail(self, notifications, error):
+        # Общее время повтора сохраняет сводку одним письмом.
+        retry_at = timezone.now() + retry_delay(notifications[0].attempts)
+        for notification in notifications:
+            notification.last_error = f'{type(error).__name__}: {error}'
+            if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+                notification.next_attempt_at = None
+                self.failed += 1
+            else:
+                notification.next_attempt_at = retry_at
+                self.retried += 1
@@ -0,0 +1,241 @@
+"""Модуль с пагинаторами для списков публикаций."""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .cache import get_feed_count, get_tag_versions, store_feed_count
+
+
+class CursorPage:
+    """Страница пагинатора по курсору.
+
+    Повторяет часть интерфейса django.core.paginator.Page, которую
+    используют шаблоны и ListView.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        """Курсор для перехода на следующую страницу."""
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        """Курсор для перехода на предыдущую страницу."""
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class CursorPaginator:
+    """Пагинатор по курсору (keyset pagination).
+
+    Вместо OFFSET страница выбирается условием на значения полей
+    сортировки последнего показанного объекта, поэтому стоимость
+    любой страницы одинакова, а COUNT(*) не выполняется вовсе.
+    Последнее поле сортировки должно быть уникальным (обычно id).
+
+    Атрибуты класса:
+    - is_cursor: Признак пагинации по курсору для шаблонов.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(name.lstrip('-') for name in self.ordering)
+
+    def encode_cursor(self, obj):
+        """Вернуть курсор, указывающий на объект."""
+        values = [
+            self._get_field(name).value_to_string(obj)
+            for name in self.fields
+        ]
+        return base64.urlsafe_b64encode(
+            json.dumps(values).encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Вернуть значения полей сортировки, закодированные в курсоре."""
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if len(values) != len(self.fields):
+                raise ValueError
+            return [
+                self._get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise InvalidPage('Некорректный курсор страницы.')
+
+    def page(self, after=None, before=None):
+        """Вернуть страницу после курсора after или перед before."""
+        ordering = self.ordering
+        cursor, forward = after, True
+        if before and not after:
+            cursor, forward = before, False
+            ordering = tuple(self._reverse(name) for name in ordering)
+        queryset = self.object_list.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(
+                self._seek_filter(ordering, self.decode_cursor(cursor))
+            )
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if forward:
+            return CursorPage(
+                object_list, self, has_next=has_more,
+                has_previous=bool(cursor)
+            )
+        object_list.reverse()
+        return CursorPage(
+            object_list, self, has_next=True, has_previous=has_more
+        )
+
+    def _get_field(self, name):
+        return self.object_list.model._meta.get_field(name)
+
+    @staticmethod
+    def _reverse(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    def _seek_filter(self, ordering, values):
+        """Условие «строго после курсора» для заданной сортировки."""
+        conditions = []
+        for position, name in enumerate(ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            equal = {
+                previous.lstrip('-'): values[index]
+                for index, previous in enumerate(ordering[:position])
+            }
+            conditions.append(
+                Q(**equal, **{f'{field}__{lookup}': values[position]})
+            )
+        return reduce(or_, conditions)
+
+
+class WindowedPage(Page):
+    """Страница с «окном» номеров вокруг текущей."""
+
+    @property
+    def page_window(self):
+        """Номера страниц для вывода: края и соседи текущей страницы."""
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=self.paginator.on_each_side,
+            on_ends=self.paginator.on_ends,
+        )
+
+
+class WindowedPaginator(Paginator):
+    """Пагинатор, выводящий ограниченное число ссылок на страницы.
+
+    Вместо всего page_range шаблон получает первую и последнюю страницы
+    и по on_each_side страниц вокруг текущей, поэтому размер разметки
+    не зависит от количества страниц.
+
+    Атрибуты класса:
+    - on_each_side: Сколько соседних страниц показывать с каждой стороны.
+    - on_ends: Сколько страниц показывать в начале и в конце.
+    """
+
+    on_each_side = 2
+    on_ends = 1
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+
+class CachedCountPaginator(WindowedPaginator):
+    """Пагинатор, берущий количество публикаций ленты из кэша.
+
+    Количество пересчитывается, только когда изменились метки ленты
+    (см. blog.cache.get_feed_count), а между пересчётами может
+    использоваться оценка. Страница по оценке не обрезается; если она
+    оказалась неполной или пустой, количество уточняется.
+    """
+
+    def __init__(self, *args, count_key=None, count_tags=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+        self.count_tags = tuple(count_tags)
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        """Возвращает количество объектов, по возможности из кэша."""
+        if self.count_key is None:
+            return self.object_list.count()
+        count, self.count_is_exact = get_feed_count(
+            self.count_key, self.count_tags, self.object_list.count
+        )
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_exact:
+                raise
+        self._set_exact_count(self.object_list.count())
+        return super().validate_number(number)
+
+    def page(self, number):
+        """Возвращает страницу, не обрезая её по оценке количества."""
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page])
+        if len(object_list) < self.per_page and (object_list or number == 1):
+            self._set_exact_count(bottom + len(object_list))
+        elif not object_list:
+            self._set_exact_count(self.object_list.count())
+            return super().page(number)
+        return self._get_page(object_list, number, self)
+
+    def _set_exact_count(self, count):
+        for name in ('count', 'num_pages', 'page_range'):
+            self.__dict__.pop(name, None)
+        self.__dict__['count'] = store_feed_count(
+            self.count_key, get_tag_versions(self.count_tags), count
+        )
+        self.count_is_exact = True
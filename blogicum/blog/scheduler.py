@@ -0,0 +1,97 @@
+"""Модуль с планировщиком отложенных публикаций."""
+import heapq
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Checkpoint, Post
+from .signals import post_went_live
+
+CHECKPOINT_NAME = 'blog:scheduler'
+
+
+class PublicationScheduler:
+    """Планировщик событий «публикация вышла в ленту».
+
+    Ближайшие даты публикации хранятся в min-heap, поэтому момент
+    следующего пробуждения определяется за O(1). Сами события
+    рассылаются по запросу к БД за промежуток от отметки до текущего
+    момента, поэтому публикации, сохранённые между перезагрузками кучи,
+    не теряются. Отметка, до которой события уже разосланы, хранится
+    в БД (Checkpoint), чтобы перезапуск или запуск по cron не терял
+    публикации; при первом запуске события рассылаются за последний
+    horizon.
+
+    Атрибуты класса:
+    - horizon: Насколько далеко вперёд загружать публикации в кучу.
+    """
+
+    horizon = timedelta(hours=1)
+
+    def __init__(self, horizon=None):
+        if horizon is not None:
+            self.horizon = horizon
+        self._heap = []
+        self._loaded_until = None
+
+    @property
+    def checked_until(self):
+        """Момент, до которого события уже разосланы."""
+        value = Checkpoint.objects.filter(name=CHECKPOINT_NAME).values_list(
+            'value', flat=True
+        ).first()
+        return value or timezone.now() - self.horizon
+
+    @checked_until.setter
+    def checked_until(self, value):
+        Checkpoint.objects.update_or_create(
+            name=CHECKPOINT_NAME, defaults={'value': value}
+        )
+
+    def load(self, now=None):
+        """Заново заполнить кучу публикациями в пределах горизонта."""
+        now = now or timezone.now()
+        self._loaded_until = now + self.horizon
+        self._heap = list(
+            Post.objects.filter(
+                is_visible=True,
+                pub_date__gt=self.checked_until,
+                pub_date__lte=self._loaded_until,
+            ).values_list('pub_date', 'id')
+        )
+        heapq.heapify(self._heap)
+
+    def next_due(self):
+        """Вернуть ближайшую дату публикации или None."""
+        return self._heap[0][0] if self._heap else None
+
+    def seconds_until_next(self, now=None):
+        """Вернуть время до ближайшего события в секундах."""
+        next_due = self.next_due()
+        if next_due is None:
+            return None
+        now = now or timezone.now()
+        return max((next_due - now).total_seconds(), 0)
+
+    def run_pending(self, now=None):
+        """Разослать события для наступивших публикаций.
+
+        Публикации выбираются из БД за промежуток от отметки до now:
+        перенесённые или скрытые публикации в него не попадают, а
+        добавленные после загрузки кучи — попадают. Отметка сдвигается
+        только после рассылки. Возвращает список вышедших публикаций.
+        """
+        now = now or timezone.now()
+        while self._heap and self._heap[0][0] <= now:
+            heapq.heappop(self._heap)
+        went_live = list(
+            Post.objects.filter(
+                is_visible=True,
+                pub_date__gt=self.checked_until,
+                pub_date__lte=now,
+            ).order_by('pub_date', 'id')
+        )
+        for post in went_live:
+            post_went_live.send(sender=Post, post=post)
+        self.checked_until = now
+        return went_live
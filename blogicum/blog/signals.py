@@ -0,0 +1,191 @@
+"""Модуль с обработчиками сигналов приложения blog."""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .cache import feed_tags, invalidate_tags
+from .images import queue_image_job
+from .models import Category, Comment, Location, Post, User
+from .utils import get_actual_comment_count, refresh_post_visibility
+
+# Отправляется планировщиком, когда наступает pub_date публикации.
+# Аргументы: post.
+post_went_live = Signal()
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Увеличивает счётчик комментариев публикации.
+
+    При загрузке фикстур (raw) счётчик уже может быть в фикстуре,
+    поэтому он пересчитывается по комментариям, а не увеличивается.
+    """
+    if raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=get_actual_comment_count()
+        )
+    elif created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев публикации.
+
+    Срабатывает и при каскадном удалении, и при удалении из админки.
+    """
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_posts_visibility(
+    sender, instance, created, raw=False, **kwargs
+):
+    """Пересчитывает видимость публикаций категории после её изменения.
+
+    Пересчёт нужен, только если изменился признак публикации (см.
+    remember_category_state). При загрузке фикстур публикации могут
+    загрузиться раньше категории.
+    """
+    if raw or (
+        not created and instance._was_published != instance.is_published
+    ):
+        refresh_post_visibility(Post.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Post)
+def refresh_loaded_post_visibility(sender, instance, raw=False, **kwargs):
+    """Вычисляет видимость публикации, загруженной из фикстуры.
+
+    При загрузке фикстур Post.save() не вызывается.
+    """
+    if raw:
+        refresh_post_visibility(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Post)
+def fill_loaded_post_updated_at(sender, instance, raw=False, **kwargs):
+    """Заполняет дату изменения публикации, загруженной из фикстуры.
+
+    При загрузке фикстур auto_now не срабатывает, а в старых выгрузках
+    (например, db.json) поля updated_at нет.
+    """
+    if raw and instance.updated_at is None:
+        instance.updated_at = instance.created_at or timezone.now()
+
+
+@receiver(post_delete, sender=Category)
+def hide_posts_without_category(sender, instance, **kwargs):
+    """Скрывает публикации, оставшиеся без категории после её удаления."""
+    Post.objects.filter(category__isnull=True, is_visible=True).update(
+        is_visible=False
+    )
+
+
+@receiver(post_went_live)
+def invalidate_live_post_feeds(sender, post, **kwargs):
+    """Сбрасывает кэш лент, в которых появилась публикация."""
+    invalidate_tags(*feed_tags(post))
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_feeds(sender, instance, **kwargs):
+    """Запоминает ленты, в которых публикация была до изменения."""
+    previous = None
+    if instance.pk is not None:
+        previous = Post.objects.only('author', 'category').filter(
+            pk=instance.pk
+        ).first()
+    instance._previous_feed_tags = feed_tags(previous) if previous else []
+
+
+@receiver(post_save, sender=Post)
+def queue_image_variants(sender, instance, raw=False, **kwargs):
+    """Ставит в очередь создание вариантов изменённого изображения."""
+    if not raw:
+        queue_image_job(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц публикации и лент, где она была или есть."""
+    invalidate_tags(
+        f'post:{instance.pk}',
+        *feed_tags(instance),
+        *getattr(instance, '_previous_feed_tags', ()),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц с публикацией комментария.
+
+    Карточки публикации в лентах помечены той же меткой, поэтому
+    вместе со страницей публикации обновится и счётчик в лентах.
+    """
+    invalidate_tags(f'post:{instance.post_id}')
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_state(sender, instance, **kwargs):
+    """Запоминает статус публикации категории до изменения."""
+    instance._was_published = None
+    if instance.pk is not None:
+        instance._was_published = Category.objects.filter(
+            pk=instance.pk
+        ).values_list('is_published', flat=True).first()
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц с категорией.
+
+    Если категорию опубликовали или сняли с публикации, меняется состав
+    лент её авторов, поэтому сбрасываются и их профили.
+    """
+    tags = [f'category:{instance.pk}', f'feed:category:{instance.pk}']
+    if instance._was_published != instance.is_published:
+        tags.append('feed:index')
+        tags.extend(
+            f'feed:profile:{author_id}' for author_id in
+            Post.objects.filter(category=instance)
+            .order_by()
+            .values_list('author_id', flat=True)
+            .distinct()
+        )
+    invalidate_tags(*tags)
+
+
+@receiver(post_delete, sender=Category)
+def invalidate_deleted_category_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц удалённой категории и главной ленты."""
+    invalidate_tags(
+        f'category:{instance.pk}', f'feed:category:{instance.pk}',
+        'feed:index'
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц с местоположением."""
+    invalidate_tags(f'location:{instance.pk}')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_pages(sender, instance, update_fields=None, **kwargs):
+    """Сбрасывает кэш страниц с пользователем.
+
+    Обновление last_login при входе на страницы не влияет.
+    """
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    invalidate_tags(f'user:{instance.pk}')
@@ -0,0 +1,12 @@
+"""Теги шаблонов для вывода карточек публикаций."""
+from django import template
+
+from blog.cache import render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Возвращает отрисованные (по возможности из кэша) карточки."""
+    return render_post_cards(posts)
@@ -0,0 +1,34 @@
+"""Теги шаблонов для вывода изображений публикаций."""
+from django import template
+
+from blog.images import IMAGE_SIZES, variants_ready
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_picture.html')
+def post_picture(post):
+    """Выводит изображение публикации с вариантами разной ширины.
+
+    Пока варианты не созданы, выводится исходное изображение.
+    """
+    context = {'post': post, 'ready': variants_ready(post)}
+    if context['ready']:
+        variants = post.image_variants
+        url = post.image.storage.url
+
+        def srcset(kind):
+            return ', '.join(
+                f'{url(name)} {size}w' for size, name in variants[kind]
+            )
+
+        fallback = srcset('fallback')
+        original = f'{post.image.url} {variants["width"]}w'
+        context.update(
+            sizes=IMAGE_SIZES,
+            srcset=f'{fallback}, {original}' if fallback else original,
+            webp_srcset=srcset('webp'),
+            width=variants['width'],
+            height=variants['height'],
+        )
+    return context
@@ -20,6 +20,11 @@ urlpatterns = [
         views.ProfileUpdateView.as_view(),
         name='edit_profile'
     ),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.CategoryDetailView.as_view(),
@@ -45,6 +50,11 @@ urlpatterns = [
         views.PostDeleteView.as_view(),
         name='delete_post'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.CommentListView.as_view(),
+        name='comments'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.CommentCreateView.as_view(),
@@ -1,14 +1,195 @@
 """Модуль с утилитами для модуля blog/views."""
-from django.db.models import Count
+import re
+from datetime import timedelta
 
-from .models import Post
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import (
+    BooleanField, Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from blogicum.constants import NUM_OF_COMMENTS
+
+from .models import Category, Comment, Post
+from .paginators import CursorPaginator
+
+# Полнотекстовый индекс FTS5 по Post.title и Post.text, поддерживается
+# триггерами (см. миграцию 0011_post_search). Есть только в SQLite.
+POST_SEARCH_TABLE = 'blog_post_search'
+MAX_SEARCH_TERMS = 10
 
 
 def get_all_post_published_query():
     """Вернуть все посты."""
-    queryset = (
-        Post.post_objects
-        .annotate(comment_count=Count('comments'))
-        .order_by('-pub_date')
-    )
+    queryset = Post.post_objects.order_by('-pub_date', '-id')
     return queryset
+
+
+def get_post_available_query(user):
+    """Вернуть посты, доступные пользователю.
+
+    Автор видит свои посты всегда, остальные — только видимые в ленте.
+    """
+    return Post.objects.select_related(
+        'author', 'category', 'location'
+    ).filter(Post.post_objects.visible_filter() | Q(author_id=user.pk))
+
+
+def get_comment_page(post, after=None):
+    """Вернуть порцию комментариев поста вместе с их авторами."""
+    paginator = CursorPaginator(
+        post.comments.select_related('author'),
+        NUM_OF_COMMENTS,
+        ordering=('created_at', 'id'),
+    )
+    return paginator.page(after=after)
+
+
+def get_actual_comment_count():
+    """Вернуть подзапрос с реальным количеством комментариев поста."""
+    return Coalesce(
+        Subquery(
+            Comment.objects
+            .filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
+def get_comment_count_mismatches():
+    """Вернуть посты, у которых счётчик комментариев расходится с БД."""
+    return (
+        Post.objects
+        .annotate(actual_count=get_actual_comment_count())
+        .exclude(comment_count=F('actual_count'))
+    )
+
+
+def recount_comments():
+    """Пересчитать счётчики комментариев.
+
+    Возвращает количество исправленных публикаций.
+    """
+    return Post.objects.filter(
+        pk__in=get_comment_count_mismatches().values('pk')
+    ).update(comment_count=get_actual_comment_count())
+
+
+def refresh_post_visibility(queryset=None):
+    """Пересчитать признак видимости публикаций одним UPDATE.
+
+    Возвращает количество обработанных публикаций.
+    """
+    if queryset is None:
+        queryset = Post.objects.all()
+    published_category = Category.objects.filter(
+        pk=OuterRef('category_id'), is_published=True
+    )
+    return queryset.update(is_visible=Case(
+        When(Exists(published_category), is_published=True, then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField(),
+    ))
+
+
+def build_search_query(text):
+    """Преобразовать строку поиска в запрос FTS5.
+
+    Каждое слово берётся в кавычки, поэтому синтаксис FTS5 в строке
+    не интерпретируется, и ищется как префикс; слова объединяются по И.
+    """
+    terms = re.findall(r'\w+', text.lower())[:MAX_SEARCH_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_posts(text, queryset=None):
+    """Вернуть публикации, найденные по строке поиска.
+
+    В SQLite результаты упорядочены по релевантности (bm25, совпадение
+    в заголовке весит больше), в остальных базах — по дате.
+    """
+    if queryset is None:
+        queryset = Post.post_objects.all()
+    match = build_search_query(text)
+    if not match:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        return queryset.filter(
+            Q(title__icontains=text) | Q(text__icontains=text)
+        ).order_by('-pub_date', '-id')
+    return queryset.extra(
+        select={'search_rank': f'bm25({POST_SEARCH_TABLE}, 10.0, 1.0)'},
+        tables=[POST_SEARCH_TABLE],
+        where=[
+            f'{POST_SEARCH_TABLE}.rowid = {Post._meta.db_table}.id',
+            f'{POST_SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match],
+        order_by=['search_rank', '-pub_date', '-id'],
+    )
+
+
+def rebuild_post_search():
+    """Перестроить и оптимизировать полнотекстовый индекс публикаций."""
+    with connection.cursor() as cursor:
+        for command in ('rebuild', 'optimize'):
+            cursor.execute(
+                f'INSERT INTO {POST_SEARCH_TABLE}({POST_SEARCH_TABLE}) '
+                'VALUES (%s)',
+                [command],
+            )
+
+
+def bulk_insert_raw(model, objects, batch_size, using=DEFAULT_DB_ALIAS):
+    """Вставить объекты пачками, как bulk_create, в «сыром» режиме.
+
+    Как при loaddata, поля auto_now и auto_now_add сохраняют значения
+    объектов, а save() и сигналы не вызываются.
+    """
+    fields = model._meta.local_concrete_fields
+    queryset = model._base_manager.using(using)
+    batch_size = min(
+        batch_size,
+        connections[using].ops.bulk_batch_size(fields, objects) or 1,
+    )
+    for start in range(0, len(objects), batch_size):
+        queryset._insert(
+            objects[start:start + batch_size],
+            fields=fields, raw=True, using=using,
+        )
+
+
+def claim_due(model, batch_size, lease):
+    """Выбрать пачку наступивших записей очереди и закрепить её за собой.
+
+    Очередь — модель с полями attempts и next_attempt_at. Запись
+    закрепляется условным UPDATE: если её уже забрал другой
+    исполнитель, next_attempt_at успел сдвинуться и строка не
+    обновится. Возвращаются только закреплённые записи, со значениями
+    полей до закрепления и уже увеличенным attempts.
+    """
+    now = timezone.now()
+    leased_until = now + timedelta(seconds=lease)
+    with transaction.atomic():
+        queryset = model.objects.filter(next_attempt_at__lte=now)
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        batch = list(queryset.order_by('next_attempt_at', 'id')[:batch_size])
+        pks = [item.pk for item in batch]
+        model.objects.filter(pk__in=pks, next_attempt_at__lte=now).update(
+            attempts=F('attempts') + 1, next_attempt_at=leased_until,
+        )
+        claimed = set(
+            model.objects.filter(
+                pk__in=pks, next_attempt_at=leased_until
+            ).values_list('pk', flat=True)
+        )
+    batch = [item for item in batch if item.pk in claimed]
+    for item in batch:
+        item.attempts += 1
+    return batch
@@ -1,22 +1,35 @@
-from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import send_mail
-from django.db.models import Count
+from django.core.paginator import InvalidPage
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 
 from blogicum.constants import NUM_OF_POSTS
+from core.mixin import ReplicaReadMixin
 
 from .forms import CommentForm, PostForm, ProfileForm
-from .mixin import CommentMixin, PostChangeMixin, PostMixin
+from .cache import post_tags, posts_tags
+from .mixin import (
+    AnonymousPageCacheMixin, CommentMixin, PaginationModeMixin,
+    PostChangeMixin, PostMixin, WriteQueueMixin
+)
 from .models import Category, Comment, Post, User
-from .utils import get_all_post_published_query
+from .notifications import queue_comment_notification
+from .paginators import WindowedPaginator
+from .utils import (
+    get_all_post_published_query, get_comment_page, get_post_available_query,
+    search_posts
+)
 
 
-class IndexListView(ListView):
+class IndexListView(
+    ReplicaReadMixin, AnonymousPageCacheMixin, PaginationModeMixin, ListView
+):
     """Главная страница со списком публикаций.
 
     Атрибуты класса:
@@ -34,8 +47,18 @@ class IndexListView(ListView):
         """Возвращает список публикаций."""
         return get_all_post_published_query()
 
+    def get_count_cache(self):
+        """Возвращает ключ и метки кэша количества публикаций."""
+        return 'index', ['feed:index']
+
+    def get_page_cache_tags(self, context):
+        """Возвращает метки кэша страницы."""
+        return ['feed:index', *posts_tags(context['page_obj'])]
+
 
-class ProfileView(ListView):
+class ProfileView(
+    ReplicaReadMixin, AnonymousPageCacheMixin, PaginationModeMixin, ListView
+):
     """Страница со списком публикаций пользователя.
 
     Атрибуты класса:
@@ -52,29 +75,39 @@ class ProfileView(ListView):
 
     def get_queryset(self):
         """Возвращает список публикаций автора."""
-        profile = get_object_or_404(
+        self.profile = get_object_or_404(
             User,
             username=self.kwargs[self.pk_url_kwarg]
         )
-        if self.request.user == profile:
-            return (
-                profile.posts.all()
-                .annotate(comment_count=Count('comments'))
-                .order_by('-pub_date')
-            )
+        if self.request.user == self.profile:
+            return self.profile.posts.select_related(
+                'author', 'category', 'location'
+            ).order_by('-pub_date', '-id')
         else:
-            return get_all_post_published_query().filter(author=profile)
+            return get_all_post_published_query().filter(author=self.profile)
 
     def get_context_data(self, **kwargs):
         """Возвращает контекстные данные для шаблона."""
         return dict(
             **super().get_context_data(**kwargs),
-            profile=get_object_or_404(
-                User,
-                username=self.kwargs[self.pk_url_kwarg]
-            )
+            profile=self.profile
         )
 
+    def get_count_cache(self):
+        """Возвращает ключ и метки кэша количества публикаций."""
+        key = f'profile:{self.profile.pk}'
+        if self.request.user == self.profile:
+            key += ':own'
+        return key, [f'feed:profile:{self.profile.pk}']
+
+    def get_page_cache_tags(self, context):
+        """Возвращает метки кэша страницы."""
+        return [
+            f'feed:profile:{self.profile.pk}',
+            f'user:{self.profile.pk}',
+            *posts_tags(context['page_obj']),
+        ]
+
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     """Обновление профиля пользователя.
@@ -98,7 +131,9 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return reverse('blog:profile', args=[self.request.user])
 
 
-class PostDetailView(PostMixin, DetailView):
+class PostDetailView(
+    ReplicaReadMixin, AnonymousPageCacheMixin, PostMixin, DetailView
+):
     """Страница выбранной публикации.
 
     Атрибуты класса:
@@ -107,30 +142,71 @@ class PostDetailView(PostMixin, DetailView):
 
     template_name = 'blog/detail.html'
 
-    def get_object(self):
-        """Возвращает данные публикацию."""
-        post = get_object_or_404(
-            Post,
-            pk=self.kwargs[self.pk_url_kwarg]
+    def get_queryset(self):
+        """Возвращает публикации, доступные пользователю."""
+        return get_post_available_query(self.request.user)
+
+    def get_context_data(self, **kwargs):
+        """Возвращает контекстные данные для шаблона."""
+        try:
+            comments_page = get_comment_page(
+                self.object, after=self.request.GET.get('comments_after')
+            )
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return dict(
+            **super().get_context_data(**kwargs),
+            form=CommentForm(),
+            comments=comments_page.object_list,
+            comments_page=comments_page,
+        )
+
+    def get_page_cache_tags(self, context):
+        """Возвращает метки кэша страницы."""
+        return [
+            *post_tags(self.object),
+            *(f'user:{comment.author_id}' for comment in context['comments']),
+        ]
+
+
+class CommentListView(ReplicaReadMixin, ListView):
+    """Фрагмент со следующей порцией комментариев публикации.
+
+    Атрибуты класса:
+    - template_name: Имя шаблона фрагмента.
+    - post_data: Объект публикации, комментарии которой выводятся.
+    """
+
+    template_name = 'includes/comment_items.html'
+    post_data = None
+
+    def get_queryset(self):
+        """Возвращает комментарии публикации после курсора."""
+        self.post_data = get_object_or_404(
+            get_post_available_query(self.request.user),
+            pk=self.kwargs['post_id']
         )
-        if self.request.user == post.author:
-            return post
-        else:
-            return get_object_or_404(
-                Post.post_objects.all(),
-                pk=self.kwargs[self.pk_url_kwarg]
+        try:
+            self.comments_page = get_comment_page(
+                self.post_data, after=self.request.GET.get('after')
             )
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return self.comments_page.object_list
 
     def get_context_data(self, **kwargs):
         """Возвращает контекстные данные для шаблона."""
         return dict(
             **super().get_context_data(**kwargs),
-            form=CommentForm(),
-            comments=self.get_object().comments.all()
+            post=self.post_data,
+            comments=self.comments_page.object_list,
+            comments_page=self.comments_page,
         )
 
 
-class PostCreateView(PostMixin, LoginRequiredMixin, CreateView):
+class PostCreateView(
+    PostMixin, LoginRequiredMixin, WriteQueueMixin, CreateView
+):
     """Создание публикации."""
 
     def form_valid(self, form):
@@ -186,8 +262,50 @@ class CategoryDetailView(IndexListView):
             category=self.category
         )
 
+    def get_count_cache(self):
+        """Возвращает ключ и метки кэша количества публикаций."""
+        return (
+            f'category:{self.category.pk}',
+            [f'feed:category:{self.category.pk}'],
+        )
+
+    def get_page_cache_tags(self, context):
+        """Возвращает метки кэша страницы."""
+        return [
+            f'feed:category:{self.category.pk}',
+            f'category:{self.category.pk}',
+            *posts_tags(context['page_obj']),
+        ]
+
+
+class SearchView(ReplicaReadMixin, ListView):
+    """Поиск публикаций по заголовку и тексту.
+
+    Атрибуты класса:
+    - template_name: Имя шаблона, используемого для отображения страницы.
+    - paginate_by: Количество публикаций на одной странице.
+    - paginator_class: Пагинатор с «окном» номеров страниц.
+    """
+
+    template_name = 'blog/search.html'
+    paginate_by = NUM_OF_POSTS
+    paginator_class = WindowedPaginator
+
+    def get_queryset(self):
+        """Возвращает найденные публикации по убыванию релевантности."""
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(self.query)
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+    def get_context_data(self, **kwargs):
+        """Возвращает контекстные данные для шаблона."""
+        return dict(
+            **super().get_context_data(**kwargs),
+            query=self.query,
+            page_query=urlencode({'q': self.query}) + '&',
+        )
+
+
+class CommentCreateView(LoginRequiredMixin, WriteQueueMixin, CreateView):
     """Создание комментария.
 
     Атрибуты класса:
@@ -204,40 +322,43 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
 
     def dispatch(self, request, *args, **kwargs):
         """Получает объект публикации."""
-        self.post_data = get_object_or_404(Post, pk=self.kwargs['post_id'])
+        self.post_data = get_object_or_404(
+            Post.objects.select_related('author'), pk=self.kwargs['post_id']
+        )
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
         """Проверяет форму и устанавливает автора комментария."""
         form.instance.author = self.request.user
         form.instance.post = self.post_data
-        if self.post_data.author != self.request.user:
-            self.send_author_email()
         return super().form_valid(form)
 
+    def save_form(self, form):
+        """Сохраняет комментарий.
+
+        Комментарий, счётчик комментариев публикации и письмо автору
+        публикации сохраняются в одной транзакции.
+        """
+        comment = super().save_form(form)
+        if self.post_data.author_id != self.request.user.pk:
+            self.send_author_email(comment)
+        return comment
+
     def get_context_data(self, **kwargs):
         """Возвращает контекстные данные для шаблона."""
         return dict(
             **super().get_context_data(**kwargs),
-            post=get_object_or_404(Post, pk=self.kwargs['post_id'])
+            post=self.post_data
         )
 
-    def send_author_email(self):
-        """Отправляет email автору публикации, при добавлении комментария."""
-        post_url = self.request.build_absolute_uri(self.get_success_url())
-        recipient_email = self.post_data.author.email
-        subject = 'New comment'
-        message = (
-            f'Пользователь {self.request.user} оставил комментарий '
-            f'к публикации {self.post_data.title}.'
-            f'Читать комментарий {post_url}'
-        )
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.FROM_EMAIL,
-            recipient_list=[recipient_email],
-            fail_silently=True,
+    def send_author_email(self, comment):
+        """Ставит в очередь email автору публикации о комментарии.
+
+        Письмо отправляет команда send_notifications, поэтому запрос
+        не ждёт почтовый бэкенд.
+        """
+        queue_comment_notification(
+            comment, self.request.build_absolute_uri(self.get_success_url())
         )
 
     def get_success_url(self):
@@ -257,3 +378,8 @@ class CommentDeleteView(CommentMixin, LoginRequiredMixin, DeleteView):
 
     CommentMixin: Базовый класс, предоставляющий функциональность.
     """
+
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        """Удаляет комментарий вместе с обновлением счётчика публикации."""
+        return super().delete(request, *args, **kwargs)
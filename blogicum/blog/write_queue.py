@@ -0,0 +1,204 @@
+"""Модуль с очередью записи в базу данных через один поток."""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import connection, transaction
+
+_STOP = object()
+
+
+class WriteQueueClosed(RuntimeError):
+    """Поток-писатель остановлен, запись в очередь не принимается."""
+
+
+class WriteQueue:
+    """Очередь записей, которые выполняет один поток-писатель.
+
+    SQLite допускает одного писателя, поэтому параллельные запросы
+    ждут блокировку и повторяют попытки. Здесь запросы передают запись
+    в очередь, а писатель выполняет накопившиеся записи пачкой в одной
+    транзакции (group commit). Каждая запись выполняется в своей точке
+    сохранения, так что ошибка одной записи не откатывает остальные.
+    Результат возвращается вызывающему потоку после фиксации транзакции.
+
+    Если транзакция пачки не фиксируется, записи пачки выполняются
+    повторно по одной, поэтому функции не должны иметь побочных
+    эффектов вне БД, которые нельзя повторить: допустимы, например,
+    сброс кэша или запись в таблицу очереди в той же транзакции.
+
+    Атрибуты класса:
+    - max_batch: Наибольшее количество записей в одной транзакции.
+    - max_delay: Сколько секунд ждать новые записи для пачки.
+    """
+
+    max_batch = 100
+    max_delay = 0.002
+
+    def __init__(self, max_batch=None, max_delay=None):
+        if max_batch is not None:
+            self.max_batch = max_batch
+        if max_delay is not None:
+            self.max_delay = max_delay
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._closed_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name='blog-write-queue', daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def closed(self):
+        """Поток-писатель завершился и записи не принимаются."""
+        return self._closed
+
+    def submit(self, func, *args, **kwargs):
+        """Выполнить func в потоке-писателе и вернуть её результат.
+
+        Если поток-писатель завершился, вызывается WriteQueueClosed:
+        записи, не взятые им в работу, не выполнялись.
+        """
+        future = Future()
+        with self._closed_lock:
+            if self._closed:
+                raise WriteQueueClosed('Очередь записи остановлена.')
+            self._queue.put((future, func, args, kwargs))
+        return future.result()
+
+    def stop(self):
+        """Дописать очередь и остановить поток-писатель."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self):
+        """Дождаться записи и добрать к ней пачку."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while batch[-1] is not _STOP and len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        try:
+            stop = False
+            while not stop:
+                batch = []
+                try:
+                    batch = self._collect()
+                    stop = batch[-1] is _STOP
+                    if stop:
+                        batch.pop()
+                    if batch:
+                        self._write(batch)
+                except Exception as error:
+                    # Поток-писатель не должен завершаться из-за ошибки:
+                    # иначе вызывающие потоки ждали бы результат вечно.
+                    self._fail(batch, error)
+                    connection.close()
+        finally:
+            with self._closed_lock:
+                self._closed = True
+            self._fail(self._drain(), WriteQueueClosed(
+                'Очередь записи остановлена.'
+            ))
+            connection.close()
+
+    def _drain(self):
+        """Забрать из очереди записи, которые уже не будут выполнены."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    @staticmethod
+    def _fail(batch, error):
+        for item in batch:
+            if item is not _STOP and not item[0].done():
+                item[0].set_exception(error)
+
+    def _write(self, batch):
+        outcomes = []
+        try:
+            with transaction.atomic():
+                for future, func, args, kwargs in batch:
+                    try:
+                        with transaction.atomic():
+                            outcomes.append((future, func(*args, **kwargs)))
+                    except Exception as error:
+                        outcomes.append((future, error))
+        except Exception as error:
+            # Отложенные проверки внешних ключей SQLite срабатывают только
+            # при фиксации, поэтому виновную запись ищем, выполняя каждую
+            # запись пачки в отдельной транзакции.
+            if len(batch) > 1:
+                for item in batch:
+                    self._write([item])
+                return
+            batch[0][0].set_exception(error)
+        else:
+            self.batches += 1
+            self.items += len(batch)
+            for future, outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+        connection.close_if_unusable_or_obsolete()
+
+
+_write_queue = None
+_lock = threading.Lock()
+
+
+def get_write_queue():
+    """Вернуть общую очередь записи, запустив её при первом вызове.
+
+    Если поток-писатель прежней очереди завершился, запускается новая.
+    """
+    global _write_queue
+    with _lock:
+        if _write_queue is None or _write_queue.closed:
+            _write_queue = WriteQueue(
+                max_batch=settings.WRITE_QUEUE_MAX_BATCH,
+                max_delay=settings.WRITE_QUEUE_MAX_DELAY,
+            )
+        return _write_queue
+
+
+def stop_write_queue():
+    """Остановить общую очередь записи, если она запущена."""
+    global _write_queue
+    with _lock:
+        if _write_queue is not None:
+            _write_queue.stop()
+            _write_queue = None
+
+
+def write(func, *args, **kwargs):
+    """Выполнить запись в транзакции, через очередь, если она включена.
+
+    Внутри уже открытой транзакции запись выполняется на месте: эта
+    транзакция может держать блокировку, которой ждал бы писатель.
+    Если поток-писатель завершился, запись тоже выполняется на месте.
+    """
+    if settings.WRITE_QUEUE_ENABLED and not connection.in_atomic_block:
+        try:
+            return get_write_queue().submit(func, *args, **kwargs)
+        except WriteQueueClosed:
+            pass
+    with transaction.atomic():
+        return func(*args, **kwargs)
@@ -1,3 +1,6 @@
 MAX_LENGTH_CHAR = 256  # Максимальное количество символов в поле
 MAX_LENGTH_SLUG = 64  # Макс
 NUM_OF_POSTS = 10  # Количество постов на странице
+NUM_OF_COMMENTS = 50  # Количество комментариев в одной порции
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)  # Ширины вариантов изображения
+IMAGE_VARIANT_QUALITY = 80  # Качество сжатия вариантов JPEG и WebP
@@ -39,6 +39,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
     # 'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
@@ -70,9 +71,80 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+    },
+    # Копия основной базы только для чтения, обновляется командой
+    # sync_replicas. В тестах это зеркало основной базы.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Псевдонимы баз из DATABASES, на которые уходит чтение в представлениях
+# только для чтения (core.mixin.ReplicaReadMixin). Пустой список
+# отключает чтение с реплик.
+DATABASE_REPLICAS = []
+
+REPLICA_STICKY_COOKIE = 'replica_pin'
+
+REPLICA_STICKY_SECONDS = 10
+
+# Применяются к каждому новому соединению SQLite (core.db).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Версии меток кэша страниц (blog/cache.py) должны видеть все процессы:
+# веб-процессы и фоновые команды (планировщик, обработка изображений),
+# поэтому кэш общий, а не LocMemCache.
+#
+# FileBasedCache подходит для одного сервера с небольшим блогом: при
+# каждой записи он просматривает каталог, а заполнившись до MAX_ENTRIES,
+# удаляет каждую CULL_FREQUENCY-ю запись без учёта давности. Удалённые
+# версии меток безопасны: отсутствующая версия считается новой, и
+# зависящие от неё страницы перерисовываются. На нескольких серверах
+# или при большом числе публикаций используйте Memcached или Redis:
+# 'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+# 'LOCATION': '127.0.0.1:11211'.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'CULL_FREQUENCY': 4,
+        },
     }
 }
 
+PAGE_CACHE_TIMEOUT = 300
+
+# Счётчики попаданий и промахов кэша страниц (команда page_cache_stats).
+PAGE_CACHE_STATS = False
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+FEED_COUNT_TIMEOUT = 60 * 10
+
+FEED_COUNT_MAX_STALENESS = 30
+
+# Запись комментариев и публикаций через один поток (blog/write_queue.py).
+WRITE_QUEUE_ENABLED = False
+
+WRITE_QUEUE_MAX_BATCH = 100
+
+WRITE_QUEUE_MAX_DELAY = 0.002
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -106,14 +178,48 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'core.mail.SpoolEmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Файлы-накопители писем core.mail.SpoolEmailBackend: новый файл
+# начинается после EMAIL_SPOOL_MAX_BYTES байт или EMAIL_SPOOL_MAX_AGE
+# секунд; прочитать письма можно командой read_spool.
+EMAIL_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+EMAIL_SPOOL_MAX_AGE = 60 * 60
+
+EMAIL_SPOOL_COMPRESS = False
+
+EMAIL_SPOOL_BUFFER_SIZE = 64 * 1024
+
+EMAIL_SPOOL_FLUSH_INTERVAL = 1
+
 FROM_EMAIL = 'from@example.com'
 
+# Повторы отправки писем из очереди уведомлений (send_notifications):
+# пауза растёт вдвое от NOTIFICATION_RETRY_BASE до NOTIFICATION_RETRY_MAX
+# секунд.
+NOTIFICATION_MAX_ATTEMPTS = 8
+
+NOTIFICATION_RETRY_BASE = 30
+
+NOTIFICATION_RETRY_MAX = 60 * 60
+
+# Окно сводки в секундах: письма одному получателю за это время уходят
+# одним сообщением. 0 — отправлять каждое уведомление отдельно.
+NOTIFICATION_DIGEST_WINDOW = 0
+
+POSTS_PAGINATION = 'numbered'
+
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
 
+# Повторы заданий process_image_jobs: пауза растёт вдвое от
+# IMAGE_JOB_RETRY_BASE секунд.
+IMAGE_JOB_MAX_ATTEMPTS = 3
+
+IMAGE_JOB_RETRY_BASE = 60
+
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
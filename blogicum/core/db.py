@@ -0,0 +1,15 @@
+"""Настройка соединений с базой данных."""
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Применить SQLITE_PRAGMAS к новому соединению SQLite.
+
+    PRAGMA действуют только в пределах соединения, поэтому выполняются
+    при каждом его открытии; при CONN_MAX_AGE это происходит редко.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,287 @@
+"""Почтовый бэкенд, дописывающий письма в файлы-накопители."""
+import atexit
+import gzip
+import itertools
+import os
+import threading
+import time
+from email import message_from_bytes, policy
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail.backends.base import BaseEmailBackend
+
+SPOOL_SUFFIX = '.eml'
+OPEN_SUFFIX = '.open'
+
+_file_numbers = itertools.count(1)
+
+
+class SpoolWriter:
+    """Файл-накопитель писем одного процесса с ротацией.
+
+    Письма дописываются в открытый файл через буфер и сбрасываются на
+    диск не чаще раза в flush_interval секунд, при заполнении буфера,
+    при закрытии соединения бэкенда (flush_pending()), при ротации
+    и при завершении процесса. Файл закрывается и
+    получает окончательное имя, когда его размер (до сжатия) превышает
+    max_bytes или возраст превышает max_age секунд, при следующей
+    записи; файл старше max_age закрывается и при закрытии соединения
+    бэкенда. Пока файл открыт, к имени добавлен суффикс OPEN_SUFFIX.
+
+    Формат записи: длина письма в байтах отдельной строкой, письмо
+    в формате RFC 5322 и перевод строки (см. iter_spool()).
+    """
+
+    def __init__(
+        self, directory, max_bytes, max_age, compress, buffer_size,
+        flush_interval,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.raw = self.stream = self.path = None
+
+    def write(self, messages):
+        """Дописать письма (bytes) в текущий файл."""
+        with self.lock:
+            if self.stream is None or self.expired():
+                self.rotate()
+            for data in messages:
+                self.stream.write(b'%d\n' % len(data))
+                self.stream.write(data)
+                self.stream.write(b'\n')
+                self.size += len(data)
+            if time.monotonic() - self.flushed_at >= self.flush_interval:
+                self.flush()
+
+    def expired(self):
+        return (
+            self.size >= self.max_bytes
+            or time.monotonic() - self.opened_at >= self.max_age
+        )
+
+    def rotate(self):
+        self.finish()
+        name = (
+            f'{time.strftime("%Y%m%dT%H%M%S")}-{os.getpid()}-'
+            f'{next(_file_numbers)}{SPOOL_SUFFIX}'
+        )
+        if self.compress:
+            name += '.gz'
+        self.path = self.directory / name
+        self.raw = open(
+            self.path.with_name(name + OPEN_SUFFIX), 'xb',
+            buffering=self.buffer_size,
+        )
+        self.stream = (
+            gzip.GzipFile(fileobj=self.raw, mode='wb')
+            if self.compress else self.raw
+        )
+        self.size = 0
+        self.opened_at = self.flushed_at = time.monotonic()
+
+    def flush(self):
+        self.stream.flush()
+        if self.stream is not self.raw:
+            self.raw.flush()
+        self.flushed_at = time.monotonic()
+
+    def flush_pending(self):
+        """Сбросить на диск всё, что записано в текущий файл.
+
+        Файл старше max_age закрывается сразу: процесс может долго
+        ничего не писать, а открытые файлы read_spool пропускает.
+        """
+        with self.lock:
+            if self.stream is None:
+                return
+            if time.monotonic() - self.opened_at >= self.max_age:
+                self.finish()
+            else:
+                self.flush()
+
+    def finish(self):
+        """Закрыть текущий файл и дать ему окончательное имя."""
+        if self.stream is None:
+            return
+        self.stream.close()
+        self.raw.close()
+        os.replace(
+            self.path.with_name(self.path.name + OPEN_SUFFIX), self.path
+        )
+        self.raw = self.stream = None
+
+    def close(self):
+        with self.lock:
+            self.finish()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+_writers_pid = os.getpid()
+
+
+def get_spool_writer(directory, **options):
+    """Вернуть общий для процесса накопитель каталога.
+
+    Отдельный файл на процесс исключает перемешивание записей; после
+    fork дочерний процесс заводит свои файлы.
+    """
+    global _writers_pid
+    with _writers_lock:
+        if _writers_pid != os.getpid():
+            _writers.clear()
+            _writers_pid = os.getpid()
+        writer = _writers.get(directory)
+        if writer is None:
+            writer = _writers[directory] = SpoolWriter(directory, **options)
+        return writer
+
+
+@atexit.register
+def close_spool_writers():
+    """Закрыть файлы всех накопителей процесса."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+        if _writers_pid != os.getpid():
+            # Файлы родительского процесса закрывает он сам.
+            writers = []
+    for writer in writers:
+        writer.close()
+
+
+class SpoolEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд с файлами-накопителями вместо файла на письмо.
+
+    Замена filebased.EmailBackend: письма пишутся в каталог
+    EMAIL_FILE_PATH, но в несколько больших файлов с ротацией
+    по EMAIL_SPOOL_MAX_BYTES и EMAIL_SPOOL_MAX_AGE и, при
+    EMAIL_SPOOL_COMPRESS, со сжатием gzip. Прочитать письма можно
+    командой read_spool.
+
+    Как и другие бэкенды Django, вне open()/close() каждый вызов
+    send_messages() работает как отдельное соединение: при его
+    закрытии буфер накопителя сбрасывается на диск, поэтому
+    отправленные письма не теряются при аварийном завершении процесса.
+    """
+
+    def __init__(
+        self, file_path=None, fail_silently=False, max_bytes=None,
+        max_age=None, compress=None, buffer_size=None, flush_interval=None,
+        **kwargs,
+    ):
+        super().__init__(fail_silently=fail_silently)
+        self.file_path = Path(file_path or settings.EMAIL_FILE_PATH)
+        try:
+            self.file_path.mkdir(parents=True, exist_ok=True)
+        except OSError as error:
+            raise ImproperlyConfigured(
+                f'Не удалось создать каталог писем {self.file_path}: {error}'
+            )
+        if not os.access(self.file_path, os.W_OK):
+            raise ImproperlyConfigured(
+                f'Нет прав на запись в каталог писем {self.file_path}.'
+            )
+        self.options = {
+            'max_bytes': max_bytes or settings.EMAIL_SPOOL_MAX_BYTES,
+            'max_age': max_age or settings.EMAIL_SPOOL_MAX_AGE,
+            'compress': (
+                settings.EMAIL_SPOOL_COMPRESS if compress is None else compress
+            ),
+            'buffer_size': buffer_size or settings.EMAIL_SPOOL_BUFFER_SIZE,
+            'flush_interval': (
+                settings.EMAIL_SPOOL_FLUSH_INTERVAL
+                if flush_interval is None else flush_interval
+            ),
+        }
+        self.writer = None
+
+    def open(self):
+        """Получить накопитель; True, если соединение открыто сейчас."""
+        if self.writer is not None:
+            return False
+        self.writer = get_spool_writer(self.file_path, **self.options)
+        return True
+
+    def close(self):
+        """Сбросить записанные письма на диск."""
+        if self.writer is None:
+            return
+        try:
+            self.writer.flush_pending()
+        except Exception:
+            if not self.fail_silently:
+                raise
+        finally:
+            self.writer = None
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        new_connection = self.open()
+        try:
+            self.writer.write(
+                message.message().as_bytes() for message in email_messages
+            )
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        finally:
+            if new_connection:
+                self.close()
+        return len(email_messages)
+
+
+def spool_files(directory, include_open=False, stale_after=None):
+    """Вернуть файлы-накопители каталога в порядке записи.
+
+    Открытые файлы, которые не изменялись дольше stale_after секунд
+    (процесс давно ничего не пишет или завершился аварийно), читаются
+    и без include_open.
+    """
+    patterns = [f'*{SPOOL_SUFFIX}', f'*{SPOOL_SUFFIX}.gz']
+    open_patterns = [pattern + OPEN_SUFFIX for pattern in patterns]
+    paths = [
+        path for pattern in patterns for path in Path(directory).glob(pattern)
+    ]
+    if include_open or stale_after is not None:
+        stale_before = time.time() - (stale_after or 0)
+        paths += [
+            path for pattern in open_patterns
+            for path in Path(directory).glob(pattern)
+            if include_open or path.stat().st_mtime < stale_before
+        ]
+    return sorted(
+        paths,
+        key=lambda path: (path.stat().st_mtime, path.name),
+    )
+
+
+def iter_spool(path):
+    """Прочитать письма из файла-накопителя.
+
+    Недописанная запись в конце файла (открытый файл или файл процесса,
+    завершившегося аварийно) пропускается.
+    """
+    path = Path(path)
+    opener = gzip.open if '.gz' in path.suffixes else open
+    with opener(path, 'rb') as stream:
+        try:
+            while True:
+                header = stream.readline()
+                if not header.endswith(b'\n'):
+                    return
+                data = stream.read(int(header))
+                if len(data) < int(header) or stream.read(1) != b'\n':
+                    return
+                yield message_from_bytes(data, policy=policy.default)
+        except EOFError:
+            return
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.mail import iter_spool, spool_files
+
+
+class Command(BaseCommand):
+    """Чтение писем из файлов-накопителей SpoolEmailBackend."""
+
+    help = (
+        'Выводит письма из файлов-накопителей core.mail.SpoolEmailBackend '
+        '(по умолчанию из EMAIL_FILE_PATH) с фильтрами по получателю и '
+        'теме. Открытые файлы пропускаются без --include-open, если они '
+        'изменялись не раньше EMAIL_SPOOL_MAX_AGE секунд назад.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='*',
+            help='Файлы или каталоги накопителей.',
+        )
+        parser.add_argument('--to', help='Часть адреса получателя.')
+        parser.add_argument('--subject', help='Часть темы письма.')
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Вывести не больше стольких писем.',
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Выводить письма целиком, а не только заголовки.',
+        )
+        parser.add_argument(
+            '--count', action='store_true',
+            help='Только посчитать подходящие письма.',
+        )
+        parser.add_argument(
+            '--include-open', action='store_true',
+            help='Читать и файлы, в которые ещё идёт запись.',
+        )
+
+    def handle(self, *args, **options):
+        count = 0
+        for message in self.iter_messages(options):
+            if options['limit'] is not None and count >= options['limit']:
+                break
+            count += 1
+            if options['count']:
+                continue
+            if options['full']:
+                self.stdout.write(message.as_string())
+            else:
+                self.stdout.write(
+                    f'{message["Date"]} | {message["To"]} | '
+                    f'{message["Subject"]}'
+                )
+        self.stdout.write(self.style.SUCCESS(f'Писем: {count}.'))
+
+    def iter_messages(self, options):
+        to = (options['to'] or '').lower()
+        subject = (options['subject'] or '').lower()
+        for path in self.get_files(options):
+            for message in iter_spool(path):
+                if to and to not in str(message['To'] or '').lower():
+                    continue
+                if subject and subject not in str(
+                    message['Subject'] or ''
+                ).lower():
+                    continue
+                yield message
+
+    def get_files(self, options):
+        files = []
+        for path in map(Path, options['paths'] or [settings.EMAIL_FILE_PATH]):
+            if path.is_dir():
+                files.extend(spool_files(
+                    path, options['include_open'],
+                    stale_after=settings.EMAIL_SPOOL_MAX_AGE,
+                ))
+            elif path.is_file():
+                files.append(path)
+            else:
+                raise CommandError(f'Нет файла или каталога {path}.')
+        return files
@@ -0,0 +1,39 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    """Обновление локальных реплик SQLite."""
+
+    help = (
+        'Копирует основную базу SQLite в реплики из DATABASE_REPLICAS '
+        'или в указанные базы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'aliases', nargs='*',
+            help='Псевдонимы баз из DATABASES, по умолчанию DATABASE_REPLICAS.'
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or settings.DATABASE_REPLICAS
+        source = connections['default']
+        if source.vendor != 'sqlite':
+            raise CommandError('Копирование реплик поддерживается для SQLite.')
+        source.ensure_connection()
+        for alias in aliases:
+            if alias not in settings.DATABASES or alias == 'default':
+                raise CommandError(f'Неизвестная реплика: {alias}.')
+            target = sqlite3.connect(str(settings.DATABASES[alias]['NAME']))
+            try:
+                source.connection.backup(target)
+            finally:
+                target.close()
+            connections[alias].close()
+            self.stdout.write(
+                self.style.SUCCESS(f'Реплика {alias} обновлена.')
+            )
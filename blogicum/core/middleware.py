@@ -0,0 +1,31 @@
+"""Модуль с промежуточным слоем проекта."""
+from django.conf import settings
+
+
+class ReplicaStickinessMiddleware:
+    """Закрепляет чтение за основной базой после изменений пользователя.
+
+    После успешного POST авторизованного пользователя ставится cookie
+    на REPLICA_STICKY_SECONDS, пока реплики догоняют основную базу
+    (см. core.mixin.ReplicaReadMixin).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method == 'POST'
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,31 @@
+"""Модуль с миксинами, общими для приложений проекта."""
+from django.conf import settings
+
+from .routers import replica_reads
+
+
+class ReplicaReadMixin:
+    """Миксин чтения с реплик для представлений только для чтения.
+
+    GET и HEAD запросы выполняются внутри replica_reads(), и шаблон
+    отрисовывается там же, так как запросы из шаблона ленивые. Если
+    пользователь только что что-то изменил (cookie REPLICA_STICKY_COOKIE,
+    см. core.middleware), чтение остаётся в основной базе, чтобы он
+    увидел свои изменения.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Выполняет запрос с чтением с реплик."""
+        if (
+            request.method not in ('GET', 'HEAD')
+            or settings.REPLICA_STICKY_COOKIE in request.COOKIES
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        # Сессия и пользователь загружаются лениво; загружаем их из
+        # основной базы, где они точно актуальны.
+        request.user.pk
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response
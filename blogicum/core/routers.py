@@ -0,0 +1,49 @@
+"""Маршрутизация запросов к базам данных."""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Направлять чтение на реплики в пределах блока with.
+
+    С enabled=False чтение внутри блока снова идёт в основную базу.
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Маршрутизатор чтения на реплики из DATABASE_REPLICAS.
+
+    На реплику уходит только чтение внутри replica_reads(), то есть в
+    представлениях только для чтения (см. core.mixin.ReplicaReadMixin).
+    Запись, а также чтение в остальных представлениях и в обработчиках
+    сигналов выполняются в основной базе.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and _replica_reads.get():
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -1,15 +1,16 @@
 from django.urls import path
-from django.views.generic import TemplateView
+
+from .views import StaticPageView
 
 app_name = 'pages'
 
 urlpatterns = [
     path(
-        'about/', TemplateView.as_view(template_name='pages/about.html'),
+        'about/', StaticPageView.as_view(template_name='pages/about.html'),
         name='about'
     ),
     path(
-        'rules/', TemplateView.as_view(template_name='pages/rules.html'),
+        'rules/', StaticPageView.as_view(template_name='pages/rules.html'),
         name='rules'
     ),
 ]
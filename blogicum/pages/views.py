@@ -3,6 +3,13 @@
 Шаблоны для этих страниц находятся в директории templates/pages/.
 """
 from django.shortcuts import render
+from django.views.generic import TemplateView
+
+from core.mixin import ReplicaReadMixin
+
+
+class StaticPageView(ReplicaReadMixin, TemplateView):
+    """Статическая страница с чтением с реплик."""
 
 
 def csrf_failure(request, reason=''):
@@ -33,6 +33,31 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache(tmp_path_factory):
+    # Тот же бэкенд, что и в проекте, но в своём каталоге: тесты не
+    # очищают кэш запущенного сервера и не мешают друг другу.
+    from django.conf import settings
+
+    caches = {
+        "default": {
+            **settings.CACHES["default"],
+            "LOCATION": tmp_path_factory.mktemp("cache"),
+        }
+    }
+    with override_settings(CACHES=caches):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(isolated_cache):
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -355,6 +380,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
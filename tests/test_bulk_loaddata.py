@@ -0,0 +1,62 @@
+import gzip
+import io
+import json
+from pathlib import Path
+
+from django.core.management import call_command
+
+import pytest
+
+from blog.management.commands.bulk_loaddata import iter_json_array
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+FIXTURE = Path(__file__).resolve().parent.parent / "db.json"
+
+
+def test_iter_json_array_small_chunks():
+    data = [{"model": "blog.category", "pk": pk} for pk in range(50)]
+    stream = io.StringIO(json.dumps(data, indent=2))
+    assert list(iter_json_array(stream, chunk_size=7)) == data, (
+        "Убедитесь, что потоковый разбор JSON-массива не зависит"
+        " от размера читаемых частей файла."
+    )
+
+
+def test_bulk_loaddata(tmp_path, PostModel):
+    fixture = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    post = next(item for item in fixture if item["model"] == "blog.post")
+    fixture.append({
+        "model": "blog.comment",
+        "pk": 1,
+        "fields": {
+            "text": "Комментарий",
+            "post": post["pk"],
+            "author": post["fields"]["author"],
+            "created_at": "2022-12-19T00:00:00Z",
+        },
+    })
+    path = tmp_path / "dump.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as stream:
+        json.dump(fixture, stream)
+
+    output = io.StringIO()
+    call_command(
+        "bulk_loaddata", str(path), "--batch-size", "7", "--defer-indexes",
+        stdout=output,
+    )
+
+    posts = [item for item in fixture if item["model"] == "blog.post"]
+    assert PostModel.objects.count() == len(posts), (
+        "Убедитесь, что команда `bulk_loaddata` загружает все публикации"
+        " из фикстуры."
+    )
+    loaded = PostModel.objects.get(pk=post["pk"])
+    assert loaded.created_at.isoformat().startswith("2022-12-18"), (
+        "Убедитесь, что `bulk_loaddata` сохраняет даты из фикстуры."
+    )
+    assert loaded.comment_count == 1 and loaded.is_visible, (
+        "Убедитесь, что после загрузки пересчитываются счётчики"
+        " комментариев и видимость публикаций."
+    )
+    assert "строк/с" in output.getvalue()
@@ -0,0 +1,76 @@
+from django.core.management import CommandError, call_command
+from django.db.models import Model
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location: Model
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при создании комментария счётчик комментариев"
+        " публикации увеличивается."
+    )
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария счётчик комментариев"
+        " публикации уменьшается."
+    )
+
+
+def test_recount_comments_command(
+        mixer: Mixer, post_with_published_location: Model
+):
+    from blog.models import Post
+
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=10)
+    with pytest.raises(CommandError):
+        call_command("recount_comments", "--check")
+    call_command("recount_comments")
+    post.refresh_from_db()
+    assert post.comment_count == 2
+    call_command("recount_comments", "--check")
+
+
+def test_comment_count_survives_loaddata(
+        mixer: Mixer, post_with_published_location: Model, tmp_path
+):
+    from blog.models import Comment
+
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post)
+    path = tmp_path / "blog.json"
+    call_command("dumpdata", "blog.post", "blog.comment", output=str(path))
+    Comment.objects.all().delete()
+    call_command("loaddata", str(path), verbosity=0)
+    post.refresh_from_db()
+    assert post.comment_count == 1 == post.comments.count(), (
+        "Убедитесь, что загрузка фикстуры не увеличивает счётчик"
+        " комментариев повторно."
+    )
+
+
+def test_stale_post_save_keeps_comment_count(
+        mixer: Mixer, post_with_published_location: Model
+):
+    from blog.models import Post
+
+    stale = Post.objects.get(pk=post_with_published_location.pk)
+    mixer.cycle(2).blend("blog.Comment", post=stale)
+    stale.title = "Новый заголовок"
+    stale.save()
+    post = Post.objects.get(pk=stale.pk)
+    assert post.title == "Новый заголовок"
+    assert post.comment_count == post.comments.count() == 2, (
+        "Убедитесь, что сохранение ранее загруженной публикации"
+        " не затирает счётчик комментариев."
+    )
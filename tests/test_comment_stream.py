@@ -0,0 +1,59 @@
+import re
+
+from django.db.models import Model
+from django.test import Client
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_stream(
+        mixer: Mixer, user_client: Client,
+        post_with_published_location: Model
+):
+    from blogicum.constants import NUM_OF_COMMENTS
+
+    post = post_with_published_location
+    total = NUM_OF_COMMENTS + 5
+    comments = mixer.cycle(total).blend("blog.Comment", post=post)
+    expected_ids = [
+        comment.id for comment in
+        sorted(comments, key=lambda item: (item.created_at, item.id))
+    ]
+
+    response = user_client.get(f"/posts/{post.id}/")
+    assert [c.id for c in response.context["comments"]] == (
+        expected_ids[:NUM_OF_COMMENTS]
+    ), (
+        "Убедитесь, что на странице публикации выводится первая порция"
+        " комментариев в порядке их создания."
+    )
+    fragment_url = re.search(
+        r'data-fragment-url="([^"]+)"', response.content.decode("utf-8")
+    ).group(1)
+
+    fragment = user_client.get(fragment_url)
+    assert fragment.status_code == 200
+    assert [c.id for c in fragment.context["comments"]] == (
+        expected_ids[NUM_OF_COMMENTS:]
+    ), (
+        "Убедитесь, что фрагмент «Показать ещё» возвращает следующую порцию"
+        " комментариев."
+    )
+    assert "data-fragment-url" not in fragment.content.decode("utf-8")
+
+
+def test_comment_stream_hidden_post(
+        mixer: Mixer, another_user_client: Client,
+        post_with_published_location: Model
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404, (
+        "Убедитесь, что комментарии скрытой публикации недоступны"
+        " другим пользователям."
+    )
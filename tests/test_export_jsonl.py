@@ -0,0 +1,47 @@
+import gzip
+import json
+
+from django.core.management import call_command
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _exported(directory, model_name):
+    rows = []
+    for path in sorted(directory.glob(f"{model_name}-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as stream:
+            rows.extend(json.loads(line) for line in stream)
+        path.unlink()
+    return rows
+
+
+def test_export_jsonl_incremental(
+        mixer, tmp_path, user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    watermark = tmp_path / "watermark.json"
+    output = tmp_path / "export"
+
+    call_command("export_jsonl", str(output), "--watermark", str(watermark))
+    assert [row["id"] for row in _exported(output, "post")] == [post.id], (
+        "Убедитесь, что команда `export_jsonl` выгружает публикации."
+    )
+    assert len(_exported(output, "comment")) == 3, (
+        "Убедитесь, что команда `export_jsonl` выгружает комментарии."
+    )
+
+    new_comment = mixer.blend("blog.Comment", post=post, author=user)
+    call_command("export_jsonl", str(output), "--watermark", str(watermark))
+    assert _exported(output, "post") == [], (
+        "Убедитесь, что при повторной выгрузке с отметкой уже выгруженные"
+        " публикации не повторяются."
+    )
+    assert [row["id"] for row in _exported(output, "comment")] == [
+        new_comment.id
+    ], (
+        "Убедитесь, что при повторной выгрузке с отметкой выгружаются"
+        " только новые комментарии."
+    )
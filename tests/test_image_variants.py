@@ -0,0 +1,132 @@
+from io import BytesIO
+
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+import pytest
+from bs4 import BeautifulSoup
+
+from blog.models import ImageJob, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_image(width=1600, height=900):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(73, 109, 137)).save(
+        buffer, format="JPEG"
+    )
+    return ImageFile(buffer, name="photo.jpg")
+
+
+@pytest.fixture
+def post_with_photo(mixer, user, published_location, published_category):
+    return mixer.blend(
+        "blog.Post",
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=make_image(),
+    )
+
+
+def process_image_jobs():
+    call_command("process_image_jobs", "--once", "--workers", "2")
+
+
+def test_variants_created_by_worker(post_with_photo, media_root):
+    assert post_with_photo.image_variants == {}
+    assert ImageJob.objects.filter(source=post_with_photo.image.name), (
+        "Убедитесь, что при сохранении публикации с изображением"
+        " ставится задание на создание вариантов."
+    )
+    process_image_jobs()
+    post = Post.objects.get(pk=post_with_photo.pk)
+    variants = post.image_variants
+    assert variants["source"] == post.image.name, (
+        "Убедитесь, что команда `process_image_jobs` создаёт варианты"
+        " изображения."
+    )
+    assert ImageJob.objects.get().finished_at
+    assert (variants["width"], variants["height"]) == (1600, 900)
+    assert [size for size, _ in variants["fallback"]] == [320, 640, 1280]
+    assert [size for size, _ in variants["webp"]] == [320, 640, 1280, 1600]
+    for size, name in variants["webp"]:
+        with Image.open(media_root / name) as image:
+            assert image.format == "WEBP" and image.width == size
+
+
+def test_original_until_variants_ready(client, post_with_photo):
+    soup = BeautifulSoup(client.get("/").content, features="html.parser")
+    assert not soup.find("picture") and soup.find(
+        "img", src=post_with_photo.image.url
+    ), (
+        "Убедитесь, что пока варианты не созданы, выводится исходное"
+        " изображение."
+    )
+
+
+def test_picture_in_templates(client, post_with_photo):
+    process_image_jobs()
+    for url in ("/", f"/posts/{post_with_photo.pk}/"):
+        soup = BeautifulSoup(client.get(url).content, features="html.parser")
+        picture = soup.find("picture")
+        assert picture and len(picture.find_all("img")) == 1, (
+            f"Убедитесь, что на странице `{url}` изображение публикации"
+            " выводится в `<picture>` с одним `<img>`."
+        )
+        img = picture.img
+        assert "320w" in img["srcset"] and img["sizes"], (
+            f"Убедитесь, что на странице `{url}` у изображения заданы"
+            " `srcset` и `sizes`."
+        )
+        assert (img["width"], img["height"]) == ("1600", "900")
+        assert ".webp 320w" in picture.source["srcset"]
+
+
+def test_stale_job_discarded(post_with_photo, media_root):
+    Post.objects.filter(pk=post_with_photo.pk).update(
+        image="images/replaced.jpg"
+    )
+    process_image_jobs()
+    post = Post.objects.get(pk=post_with_photo.pk)
+    assert post.image_variants == {}, (
+        "Убедитесь, что варианты заменённого изображения не сохраняются."
+    )
+    assert not any((media_root / "images" / "variants").iterdir())
+
+
+def test_build_image_variants_command(post_with_photo):
+    call_command("build_image_variants")
+    post = Post.objects.get(pk=post_with_photo.pk)
+    assert post.image_variants.get("source") == post.image.name, (
+        "Убедитесь, что команда `build_image_variants` создаёт варианты"
+        " для сохранённых изображений."
+    )
+
+
+def test_stale_post_save_keeps_variants(post_with_photo, media_root):
+    stale = Post.objects.get(pk=post_with_photo.pk)
+    process_image_jobs()
+    stale.title = "Новый заголовок"
+    stale.save()
+    post = Post.objects.get(pk=stale.pk)
+    assert post.title == "Новый заголовок"
+    assert post.image_variants.get("source") == post.image.name, (
+        "Убедитесь, что сохранение ранее загруженной публикации"
+        " не затирает варианты изображения."
+    )
+
+    stale.image = None
+    stale.save()
+    assert Post.objects.get(pk=stale.pk).image_variants == {}
+    assert not any((media_root / "images" / "variants").iterdir()), (
+        "Убедитесь, что при удалении изображения удаляются и его варианты."
+    )
@@ -0,0 +1,59 @@
+import json
+
+from django.core.management import call_command
+
+import pytest
+
+from blog.management.commands.loadtest import ROUTES
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def test_loadtest_report(
+        tmp_path, mixer, user, post_with_published_location
+):
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    output = tmp_path / "loadtest.json"
+    # Общая БД SQLite в памяти не ждёт блокировок (busy_timeout), поэтому
+    # в тесте один поток.
+    call_command(
+        "loadtest", "--workers", "1", "--requests", "80", "--seed", "1",
+        "--output", str(output), stdout=open(tmp_path / "stdout", "w"),
+    )
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["total"]["requests"] == 80, (
+        "Убедитесь, что каждый поток `loadtest` отправляет заданное"
+        " количество запросов."
+    )
+    assert report["total"]["errors"] == 0, (
+        "Убедитесь, что запросы нагрузочного теста выполняются без ошибок:"
+        f" {report['routes']}"
+    )
+    assert set(report["routes"]) <= set(ROUTES)
+    for stats in report["routes"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+
+def test_loadtest_discards_notifications(
+        tmp_path, mixer, user, another_user, post_with_published_location
+):
+    from blog.models import Comment, CommentNotification
+
+    post = post_with_published_location
+    mixer.blend(
+        "blog.Post", author=another_user, category=post.category,
+        location=post.location,
+    )
+    mix = tmp_path / "mix.json"
+    mix.write_text(json.dumps({"add_comment": 1}), encoding="utf-8")
+    call_command(
+        "loadtest", "--workers", "1", "--requests", "20", "--seed", "1",
+        "--mix", str(mix), stdout=open(tmp_path / "stdout", "w"),
+    )
+    assert Comment.objects.count() == 20
+    assert not CommentNotification.objects.exists(), (
+        "Убедитесь, что уведомления о комментариях нагрузочного теста"
+        " не остаются в очереди на отправку."
+    )
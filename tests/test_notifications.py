@@ -0,0 +1,147 @@
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+import pytest
+
+from blog.models import CommentNotification
+
+pytestmark = [pytest.mark.django_db]
+
+
+def add_comment(client, post):
+    return client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Комментарий"}
+    )
+
+
+def test_comment_notification_queued(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = add_comment(another_user_client, post)
+    assert response.status_code == 302
+    assert not mail.outbox, (
+        "Убедитесь, что письмо автору публикации не отправляется"
+        " во время запроса на создание комментария."
+    )
+    notification = CommentNotification.objects.get()
+    assert notification.recipient == post.author.email, (
+        "Убедитесь, что письмо о комментарии ставится в очередь"
+        " для автора публикации."
+    )
+
+    call_command("send_notifications", "--once")
+    assert len(mail.outbox) == 1, (
+        "Убедитесь, что команда `send_notifications` отправляет письма"
+        " из очереди."
+    )
+    notification.refresh_from_db()
+    assert notification.sent_at and notification.next_attempt_at is None
+
+    call_command("send_notifications", "--once")
+    assert len(mail.outbox) == 1, (
+        "Убедитесь, что отправленное письмо не отправляется повторно."
+    )
+
+
+def test_own_comment_not_notified(user_client, post_with_published_location):
+    add_comment(user_client, post_with_published_location)
+    assert not CommentNotification.objects.exists(), (
+        "Убедитесь, что автор не получает писем о своих комментариях."
+    )
+
+
+def test_notification_retry_backoff(
+        monkeypatch, settings, another_user_client,
+        post_with_published_location
+):
+    settings.NOTIFICATION_MAX_ATTEMPTS = 2
+
+    def broken(self, messages):
+        raise ConnectionError("почтовый сервер недоступен")
+
+    monkeypatch.setattr(EmailBackend, "send_messages", broken)
+    add_comment(another_user_client, post_with_published_location)
+    notification = CommentNotification.objects.get()
+
+    call_command("send_notifications", "--once")
+    notification.refresh_from_db()
+    assert notification.attempts == 1 and notification.sent_at is None
+    assert notification.next_attempt_at > notification.created_at, (
+        "Убедитесь, что неудачная отправка повторяется с задержкой."
+    )
+    assert "ConnectionError" in notification.last_error
+
+    CommentNotification.objects.update(
+        next_attempt_at=notification.created_at
+    )
+    call_command("send_notifications", "--once")
+    notification.refresh_from_db()
+    assert notification.attempts == 2, (
+        "Убедитесь, что после NOTIFICATION_MAX_ATTEMPTS неудачных попыток"
+        " письмо больше не отправляется."
+    )
+    assert notification.next_attempt_at is None
+
+
+def test_notification_digest(
+        settings, another_user_client, post_with_published_location
+):
+    settings.NOTIFICATION_DIGEST_WINDOW = 60
+    post = post_with_published_location
+    for _ in range(3):
+        add_comment(another_user_client, post)
+    assert CommentNotification.objects.count() == 3
+
+    call_command("send_notifications", "--once")
+    assert not mail.outbox, (
+        "Убедитесь, что в режиме сводки письма ждут окончания окна"
+        " NOTIFICATION_DIGEST_WINDOW."
+    )
+
+    CommentNotification.objects.update(next_attempt_at=post.pub_date)
+    call_command("send_notifications", "--once")
+    assert len(mail.outbox) == 1, (
+        "Убедитесь, что уведомления одному получателю за окно сводки"
+        " отправляются одним письмом."
+    )
+    assert mail.outbox[0].body.count("Читать комментарий") == 3
+    assert not CommentNotification.objects.filter(
+        sent_at__isnull=True
+    ).exists()
+
+
+def test_claim_skips_rows_taken_by_another_sender(
+        another_user_client, post_with_published_location
+):
+    from datetime import timedelta
+
+    from django.db import connection
+    from django.utils import timezone
+
+    from blog.notifications import OutboxSender
+
+    for _ in range(2):
+        add_comment(another_user_client, post_with_published_location)
+    taken, free = CommentNotification.objects.order_by("id")
+    competing = []
+
+    def another_sender(execute, sql, params, many, context):
+        # Другой отправитель успевает забрать письмо между выборкой
+        # пачки и её закреплением.
+        if sql.startswith("UPDATE") and not competing:
+            competing.append(sql)
+            CommentNotification.objects.filter(pk=taken.pk).update(
+                next_attempt_at=timezone.now() + timedelta(minutes=5)
+            )
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(another_sender):
+        batch = OutboxSender().claim()
+    assert [notification.pk for notification in batch] == [free.pk], (
+        "Убедитесь, что отправитель закрепляет за собой только письма,"
+        " которые не успел забрать другой отправитель."
+    )
+    taken.refresh_from_db()
+    assert taken.attempts == 0
@@ -0,0 +1,135 @@
+from django.db.models import Model
+from django.test import Client
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _cache_state(client: Client, url: str) -> str:
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.get("X-Page-Cache")
+
+
+def test_anonymous_feed_cache(
+        mixer: Mixer, client: Client, user_client: Client,
+        post_with_published_location: Model, settings
+):
+    from blog.cache import get_page_cache_stats
+
+    settings.PAGE_CACHE_STATS = True
+    post = post_with_published_location
+    assert _cache_state(client, "/") == "miss"
+    assert _cache_state(client, "/") == "hit", (
+        "Убедитесь, что главная страница для анонимного посетителя"
+        " отдаётся из кэша."
+    )
+    assert get_page_cache_stats() == {"hits": 1, "misses": 1}
+    assert _cache_state(user_client, "/") is None, (
+        "Убедитесь, что страницы авторизованных пользователей не кэшируются."
+    )
+
+    mixer.blend("blog.Location")
+    assert _cache_state(client, "/") == "hit", (
+        "Убедитесь, что изменение, не касающееся страницы, не сбрасывает"
+        " её кэш."
+    )
+
+    mixer.blend("blog.Comment", post=post)
+    assert _cache_state(client, "/") == "miss", (
+        "Убедитесь, что новый комментарий сбрасывает кэш лент с его"
+        " публикацией."
+    )
+
+    post.location.name = "Новое место"
+    post.location.save()
+    assert _cache_state(client, "/") == "miss"
+    assert "Новое место" in client.get("/").content.decode("utf-8")
+
+
+def test_anonymous_detail_and_profile_cache(
+        client: Client, post_with_published_location: Model
+):
+    post = post_with_published_location
+    detail_url = f"/posts/{post.id}/"
+    profile_url = f"/profile/{post.author.username}/"
+    for url in (detail_url, profile_url):
+        assert _cache_state(client, url) == "miss"
+        assert _cache_state(client, url) == "hit"
+
+    post.author.first_name = "Переименованный"
+    post.author.save()
+    for url in (detail_url, profile_url):
+        assert _cache_state(client, url) == "miss", (
+            "Убедитесь, что изменение пользователя сбрасывает кэш страниц,"
+            " на которых он показан."
+        )
+
+    post.is_published = False
+    post.save()
+    response = client.get(detail_url)
+    assert response.status_code == 404, (
+        "Убедитесь, что снятая с публикации запись не отдаётся из кэша."
+    )
+
+
+def test_post_card_cache(post_with_published_location: Model):
+    from blog.cache import render_post_cards
+    from blog.models import Post
+
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    first = render_post_cards([post])
+    assert render_post_cards([post]) == first
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in render_post_cards([post])[0], (
+        "Убедитесь, что после изменения публикации её карточка"
+        " отрисовывается заново."
+    )
+
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    post.refresh_from_db()
+    assert "(42)" in render_post_cards([post])[0], (
+        "Убедитесь, что карточка учитывает количество комментариев."
+    )
+
+
+def test_default_cache_shared_between_processes():
+    from django.conf import settings
+
+    assert "locmem" not in settings.CACHES["default"]["BACKEND"], (
+        "Убедитесь, что кэш по умолчанию общий для всех процессов:"
+        " иначе фоновые команды не сбросят кэш страниц веб-процессов."
+    )
+
+
+def test_evicted_tag_version_invalidates_pages(
+        client: Client, post_with_published_location: Model
+):
+    from django.core.cache import cache
+
+    from blog.cache import TAG_VERSION_KEY, invalidate_tags
+
+    cache.clear()
+    assert _cache_state(client, "/") == "miss"
+    invalidate_tags("feed:index")
+    cache.delete(TAG_VERSION_KEY.format("feed:index"))
+    assert _cache_state(client, "/") == "miss", (
+        "Убедитесь, что страница, версия метки которой вытеснена из кэша,"
+        " считается устаревшей."
+    )
+    assert _cache_state(client, "/") == "hit"
+
+
+def test_page_cache_stats_disabled_by_default(client: Client):
+    from blog.cache import get_page_cache_stats
+
+    _cache_state(client, "/")
+    _cache_state(client, "/")
+    assert get_page_cache_stats() == {"hits": 0, "misses": 0}, (
+        "Убедитесь, что счётчики кэша страниц по умолчанию не ведутся:"
+        " это запись в общий кэш на каждый запрос."
+    )
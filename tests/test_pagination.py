@@ -0,0 +1,115 @@
+import re
+
+from django.test import override_settings
+
+import pytest
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get_page(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (
+        "Убедитесь, что страница с пагинацией по курсору загружается"
+        " без ошибок."
+    )
+    return response
+
+
+@override_settings(POSTS_PAGINATION="cursor")
+def test_cursor_pagination(
+        user_client, many_posts_with_published_locations
+):
+    posts = many_posts_with_published_locations
+    expected = sorted(
+        posts, key=lambda post: (post.pub_date, post.id), reverse=True
+    )
+
+    first = _get_page(user_client, "/")
+    first_ids = [post.id for post in first.context["page_obj"]]
+    assert first_ids == [post.id for post in expected[:N_PER_PAGE]], (
+        "Убедитесь, что первая страница при пагинации по курсору содержит"
+        " самые новые публикации."
+    )
+
+    next_url = re.search(
+        r'href="(\?after=[\w-]+)"', first.content.decode("utf-8")
+    ).group(1)
+    second = _get_page(user_client, f"/{next_url}")
+    second_ids = [post.id for post in second.context["page_obj"]]
+    assert second_ids == [
+        post.id for post in expected[N_PER_PAGE:N_PER_PAGE * 2]
+    ], (
+        "Убедитесь, что ссылка на следующую страницу при пагинации по курсору"
+        " ведёт на продолжение ленты."
+    )
+
+    previous_url = re.search(
+        r'href="(\?before=[\w-]+)"', second.content.decode("utf-8")
+    ).group(1)
+    previous = _get_page(user_client, f"/{previous_url}")
+    assert [post.id for post in previous.context["page_obj"]] == first_ids
+
+
+@override_settings(POSTS_PAGINATION="cursor")
+def test_cursor_pagination_bad_cursor(user_client):
+    response = user_client.get("/?after=broken")
+    assert response.status_code == 404, (
+        "Убедитесь, что при некорректном курсоре возвращается статус 404."
+    )
+
+
+def test_windowed_page_links(mixer, user_client, user, published_category):
+    from django.utils import timezone
+
+    mixer.cycle(N_PER_PAGE * 20).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now(),
+    )
+    response = user_client.get("/?page=10")
+    content = response.content.decode("utf-8")
+    page_links = set(re.findall(r'href="\?page=(\d+)"', content))
+    assert page_links == {"1", "8", "9", "11", "12", "20"}, (
+        "Убедитесь, что пагинатор выводит ссылки только на крайние"
+        " страницы и на страницы рядом с текущей."
+    )
+
+
+def test_feed_count_cached(mixer, user_client, user, published_category):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+
+    mixer.cycle(N_PER_PAGE * 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now(),
+    )
+    user_client.get("/")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/?page=2")
+    assert response.status_code == 200
+    assert not any(
+        "COUNT(" in query["sql"] for query in queries.captured_queries
+    ), (
+        "Убедитесь, что количество публикаций ленты берётся из кэша,"
+        " пока лента не изменилась."
+    )
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now(),
+    )
+    response = user_client.get(f"/?page={3 + 1}")
+    assert response.status_code == 200, (
+        "Убедитесь, что при устаревшем количестве публикаций страница,"
+        " появившаяся после добавления публикации, всё равно открывается."
+    )
+    assert response.context["paginator"].count == N_PER_PAGE * 3 + 1
@@ -0,0 +1,76 @@
+from django.db.models import Model
+from django.test import Client
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+# Запросы сессии и пользователя, которые выполняет любой запрос
+# авторизованного клиента.
+AUTH_QUERIES = 2
+
+
+@pytest.fixture
+def own_comment(mixer: Mixer, user: Model, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+
+
+@pytest.mark.parametrize("client_name", ["user_client", "another_user_client"])
+def test_post_detail_queries(
+        request, client_name, post_with_published_location,
+        django_assert_num_queries
+):
+    client: Client = request.getfixturevalue(client_name)
+    mixer: Mixer = request.getfixturevalue("mixer")
+    mixer.cycle(5).blend("blog.Comment", post=post_with_published_location)
+    url = f"/posts/{post_with_published_location.id}/"
+    # Публикация с автором, категорией и местом; комментарии с авторами.
+    with django_assert_num_queries(AUTH_QUERIES + 2):
+        response = client.get(url)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    ("url_name", "queries"),
+    [
+        # Публикация; варианты местоположения и категории в форме.
+        ("edit", 3),
+        # Публикация; местоположение для формы подтверждения.
+        ("delete", 2),
+    ],
+)
+def test_post_change_queries(
+        url_name, queries, user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    url = f"/posts/{post_with_published_location.id}/{url_name}/"
+    with django_assert_num_queries(AUTH_QUERIES + queries):
+        response = user_client.get(url)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("url_name", ["edit_comment", "delete_comment"])
+def test_comment_change_queries(
+        url_name, user_client, own_comment, django_assert_num_queries
+):
+    url = f"/posts/{own_comment.post_id}/{url_name}/{own_comment.id}"
+    # Только сам комментарий.
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = user_client.get(url)
+    assert response.status_code == 200
+
+
+def test_comment_create_queries(
+        another_user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    # Публикация с автором; точка сохранения, INSERT комментария,
+    # UPDATE счётчика, INSERT письма в очередь уведомлений
+    # и освобождение точки сохранения.
+    with django_assert_num_queries(AUTH_QUERIES + 6):
+        response = another_user_client.post(url, {"text": "Комментарий"})
+    assert response.status_code == 302
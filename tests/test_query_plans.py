@@ -0,0 +1,70 @@
+import re
+
+from django.db import connection
+from django.db.models import Model
+
+import pytest
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Проверяется план запроса SQLite (EXPLAIN QUERY PLAN).",
+    ),
+]
+
+FULL_SCAN = re.compile(r"\bSCAN blog_post\b")
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def _assert_indexed(queryset, index_name: str, feed: str):
+    plan = queryset.explain()
+    assert not FULL_SCAN.search(plan), (
+        f"Убедитесь, что запрос ленты «{feed}» не выполняет полный просмотр"
+        f" таблицы публикаций:\n{plan}"
+    )
+    assert TEMP_SORT not in plan, (
+        f"Убедитесь, что сортировка ленты «{feed}» выполняется по индексу,"
+        f" а не во временном B-дереве:\n{plan}"
+    )
+    assert index_name in plan, (
+        f"Убедитесь, что запрос ленты «{feed}» использует индекс"
+        f" `{index_name}`:\n{plan}"
+    )
+
+
+def test_index_feed_plan():
+    from blog.utils import get_all_post_published_query
+
+    _assert_indexed(
+        get_all_post_published_query()[:10],
+        "post_visible_feed_idx",
+        "главная страница",
+    )
+
+
+def test_category_feed_plan(published_category: Model):
+    from blog.utils import get_all_post_published_query
+
+    _assert_indexed(
+        get_all_post_published_query().filter(
+            category=published_category
+        )[:10],
+        "post_category_feed_idx",
+        "страница категории",
+    )
+
+
+def test_author_feed_plans(user: Model):
+    from blog.utils import get_all_post_published_query
+
+    _assert_indexed(
+        get_all_post_published_query().filter(author=user)[:10],
+        "post_author_feed_idx",
+        "профиль для посетителя",
+    )
+    _assert_indexed(
+        user.posts.order_by("-pub_date", "-id")[:10],
+        "post_author_feed_idx",
+        "профиль для автора",
+    )
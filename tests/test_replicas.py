@@ -0,0 +1,74 @@
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+
+from core.routers import ReplicaRouter, replica_reads
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+]
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+
+
+def _replica_queries(client, url):
+    with CaptureQueriesContext(connections["replica"]) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+def test_router(replicas):
+    from blog.models import Post
+
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) == "default"
+    with replica_reads():
+        assert router.db_for_read(Post) == "replica", (
+            "Убедитесь, что внутри `replica_reads()` чтение направляется"
+            " на реплику."
+        )
+        assert router.db_for_write(Post) == "default", (
+            "Убедитесь, что запись всегда направляется в основную базу."
+        )
+
+
+def test_read_views_use_replica(
+        replicas, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in ("/", f"/posts/{post.id}/", f"/profile/{post.author}/"):
+        assert _replica_queries(user_client, url), (
+            f"Убедитесь, что страница `{url}` читает данные с реплики."
+        )
+
+
+def test_sticky_reads_after_write(
+        replicas, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Комментарий"}
+    )
+    assert response.status_code == 302
+    assert not _replica_queries(user_client, f"/posts/{post.id}/"), (
+        "Убедитесь, что сразу после изменений автор читает данные"
+        " из основной базы."
+    )
+
+
+def test_cached_pages_rendered_from_default(
+        replicas, client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in ("/", f"/posts/{post.id}/", f"/profile/{post.author}/"):
+        assert not _replica_queries(client, url), (
+            f"Убедитесь, что страница `{url}`, которая сохраняется в кэш,"
+            " отрисовывается из основной базы: реплика может отставать"
+            " от сброшенных версий меток."
+        )
+        assert client.get(url)["X-Page-Cache"] == "hit"
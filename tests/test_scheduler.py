@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.db.models import Model
+from django.utils import timezone
+
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduler_fires_go_live_events(
+        mixer: Mixer, user: Model, published_category: Model
+):
+    from blog.cache import feed_tags, get_tag_versions
+    from blog.scheduler import PublicationScheduler
+    from blog.signals import post_went_live
+
+    now = timezone.now()
+    soon, later = mixer.cycle(2).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=(now + timedelta(minutes=m) for m in (5, 30)),
+    )
+    fired = []
+
+    def on_live(sender, post, **kwargs):
+        fired.append(post.pk)
+
+    post_went_live.connect(on_live)
+    try:
+        scheduler = PublicationScheduler()
+        scheduler.checked_until = now
+        scheduler.load(now)
+        assert scheduler.next_due() == soon.pub_date, (
+            "Убедитесь, что ближайшим событием планировщика является"
+            " публикация с наименьшей датой."
+        )
+        versions = get_tag_versions(feed_tags(soon))
+
+        assert scheduler.run_pending(now + timedelta(minutes=1)) == []
+        assert scheduler.run_pending(now + timedelta(minutes=10)) == [soon]
+        assert fired == [soon.pk]
+        assert all(
+            version > versions[tag]
+            for tag, version in get_tag_versions(feed_tags(soon)).items()
+        ), "Убедитесь, что при выходе публикации сбрасывается кэш её лент."
+
+        later.pub_date = now + timedelta(hours=2)
+        later.save()
+        assert scheduler.run_pending(now + timedelta(minutes=40)) == [], (
+            "Убедитесь, что для перенесённой публикации событие не"
+            " отправляется."
+        )
+    finally:
+        post_went_live.disconnect(on_live)
+
+
+def test_scheduler_catches_posts_added_after_load(
+        mixer: Mixer, user: Model, published_category: Model
+):
+    from blog.scheduler import PublicationScheduler
+
+    now = timezone.now()
+    scheduler = PublicationScheduler()
+    scheduler.checked_until = now
+    scheduler.load(now)
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=now + timedelta(seconds=20),
+    )
+    assert scheduler.run_pending(now + timedelta(seconds=30)) == [post], (
+        "Убедитесь, что планировщик отправляет событие для публикации,"
+        " сохранённой после загрузки кучи."
+    )
+
+
+def test_run_scheduler_once_without_checkpoint(
+        mixer: Mixer, user: Model, published_category: Model
+):
+    from django.core.management import call_command
+
+    from blog.models import Checkpoint
+    from blog.signals import post_went_live
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(minutes=5),
+    )
+    fired = []
+
+    def on_live(sender, post, **kwargs):
+        fired.append(post.pk)
+
+    post_went_live.connect(on_live)
+    try:
+        call_command("run_scheduler", "--once")
+        call_command("run_scheduler", "--once")
+    finally:
+        post_went_live.disconnect(on_live)
+    assert fired == [post.pk], (
+        "Убедитесь, что запуск `run_scheduler --once` без сохранённой"
+        " отметки отправляет события за последний горизонт ровно один раз."
+    )
+    assert Checkpoint.objects.exists(), (
+        "Убедитесь, что отметка планировщика хранится в БД."
+    )
@@ -0,0 +1,64 @@
+from django.utils import timezone
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def search_posts(mixer, user, published_category):
+    def make(title, text, **kwargs):
+        return mixer.blend(
+            "blog.Post",
+            title=title,
+            text=text,
+            author=user,
+            category=published_category,
+            pub_date=kwargs.pop("pub_date", timezone.now()),
+            **kwargs,
+        )
+
+    return {
+        "title": make("Кэширование страниц", "Про производительность."),
+        "text": make("Заметки", "Немного о кэшировании запросов."),
+        "other": make("Прогулка", "Парк и погода."),
+        "hidden": make(
+            "Кэширование черновика", "Черновик.", is_published=False
+        ),
+    }
+
+
+def _found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200, (
+        "Убедитесь, что страница поиска `/search/` загружается без ошибок."
+    )
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranked_and_visible(client, search_posts):
+    found = _found(client, "кэширов")
+    assert found == [search_posts["title"].id, search_posts["text"].id], (
+        "Убедитесь, что поиск находит публикации по заголовку и тексту,"
+        " ставит совпадения в заголовке выше и не показывает скрытые"
+        " публикации."
+    )
+
+
+def test_search_index_follows_updates(client, search_posts):
+    post = search_posts["other"]
+    post.text = "Кэширование в парке."
+    post.save()
+    assert post.id in _found(client, "кэширование"), (
+        "Убедитесь, что индекс поиска обновляется при изменении публикации."
+    )
+    post.delete()
+    assert post.id not in _found(client, "кэширование")
+
+
+def test_search_query_syntax_is_escaped(client, search_posts):
+    assert _found(client, 'NEAR(" OR *') == [], (
+        "Убедитесь, что синтаксис FTS5 в строке поиска не приводит"
+        " к ошибке."
+    )
+    assert _found(client, "") == []
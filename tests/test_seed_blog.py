@@ -0,0 +1,37 @@
+import io
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from blog.models import Comment, Post
+from blog.utils import get_comment_count_mismatches
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_seed_blog(user):
+    output = io.StringIO()
+    call_command(
+        "seed_blog", "--users", "10", "--categories", "3",
+        "--locations", "4", "--posts", "200", "--comments", "1000",
+        "--scheduled", "0.1", "--unpublished", "0.1", "--batch-size", "64",
+        "--seed", "1", stdout=output,
+    )
+    assert Post.objects.count() == 200
+    assert Comment.objects.count() == 1000, (
+        "Убедитесь, что `seed_blog` создаёт заданное количество"
+        " комментариев."
+    )
+    assert not get_comment_count_mismatches().exists(), (
+        "Убедитесь, что `seed_blog` заполняет счётчики комментариев"
+        " в соответствии с созданными комментариями."
+    )
+    now = timezone.now()
+    assert Post.objects.filter(pub_date__gt=now, is_visible=True).exists(), (
+        "Убедитесь, что `seed_blog` создаёт отложенные публикации."
+    )
+    assert not Comment.objects.filter(post__is_visible=False).exists()
+    assert Post.post_objects.count() < 200
+    assert "строк/с" in output.getvalue()
@@ -0,0 +1,135 @@
+from io import StringIO
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management import call_command
+
+import pytest
+
+from core.mail import close_spool_writers, iter_spool, spool_files
+
+BACKEND = "core.mail.SpoolEmailBackend"
+
+
+def send(connection, count):
+    return connection.send_messages([
+        EmailMessage(
+            subject=f"Письмо {number}", body="Текст письма " * 20,
+            from_email="from@example.com", to=[f"user{number}@example.com"],
+        )
+        for number in range(count)
+    ])
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_spool_backend_rotates_files(tmp_path, compress):
+    connection = get_connection(
+        BACKEND, file_path=tmp_path, max_bytes=2000, compress=compress,
+    )
+    assert send(connection, 10) == 10
+    assert send(connection, 10) == 10
+    assert len(spool_files(tmp_path, include_open=True)) == len(
+        spool_files(tmp_path)
+    ) + 1, (
+        "Убедитесь, что файл-накопитель получает окончательное имя"
+        " только после закрытия."
+    )
+    close_spool_writers()
+
+    files = spool_files(tmp_path)
+    assert 1 < len(files) < 20, (
+        "Убедитесь, что бэкенд дописывает письма в общие файлы"
+        " и начинает новый файл по достижении размера."
+    )
+    messages = [message for path in files for message in iter_spool(path)]
+    assert [message["Subject"] for message in messages] == [
+        f"Письмо {number}" for number in range(10)
+    ] * 2, "Убедитесь, что письма читаются из накопителей без потерь."
+    assert "Текст письма" in messages[0].get_content()
+
+
+def test_read_spool_command(tmp_path):
+    send(get_connection(BACKEND, file_path=tmp_path), 5)
+    close_spool_writers()
+    # Недописанная запись в открытом файле пропускается.
+    (tmp_path / "broken.eml.open").write_bytes(b"100\nFrom: x")
+
+    out = StringIO()
+    call_command(
+        "read_spool", str(tmp_path), "--to", "user3", "--include-open",
+        stdout=out,
+    )
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 2 and "Письмо 3" in lines[0], (
+        "Убедитесь, что команда `read_spool` выводит письма,"
+        " подходящие под фильтр."
+    )
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_spool_flushed_on_close(tmp_path, compress):
+    connection = get_connection(
+        BACKEND, file_path=tmp_path, compress=compress,
+        buffer_size=1 << 20, flush_interval=3600,
+    )
+
+    def on_disk():
+        return [
+            message["Subject"]
+            for path in spool_files(tmp_path, include_open=True)
+            for message in iter_spool(path)
+        ]
+
+    connection.open()
+    send(connection, 3)
+    connection.close()
+    assert on_disk() == [f"Письмо {number}" for number in range(3)], (
+        "Убедитесь, что при закрытии соединения письма сбрасываются"
+        " на диск."
+    )
+    send(connection, 2)
+    assert len(on_disk()) == 5, (
+        "Убедитесь, что письма, отправленные без открытого соединения,"
+        " сбрасываются на диск до возврата из `send_messages`."
+    )
+    close_spool_writers()
+
+
+def test_idle_spool_file_finished_on_close(tmp_path):
+    import time
+
+    connection = get_connection(BACKEND, file_path=tmp_path, max_age=0.05)
+    send(connection, 2)
+    assert len(spool_files(tmp_path, include_open=True)) == 1
+    time.sleep(0.1)
+    connection.open()
+    connection.close()
+    assert [len(list(iter_spool(path))) for path in spool_files(tmp_path)] == [
+        2
+    ], (
+        "Убедитесь, что файл-накопитель старше EMAIL_SPOOL_MAX_AGE"
+        " закрывается при закрытии соединения, даже если писем больше нет."
+    )
+    close_spool_writers()
+
+
+def test_read_spool_reads_stale_open_files(tmp_path, settings):
+    import os
+    import time
+
+    send(get_connection(BACKEND, file_path=tmp_path), 3)
+    close_spool_writers()
+    (path,) = spool_files(tmp_path)
+    stale = path.rename(path.with_name(path.name + ".open"))
+
+    def read():
+        out = StringIO()
+        call_command("read_spool", str(tmp_path), "--count", stdout=out)
+        return out.getvalue()
+
+    assert "Писем: 0" in read()
+    old = time.time() - settings.EMAIL_SPOOL_MAX_AGE - 1
+    os.utime(stale, (old, old))
+    assert "Писем: 3" in read(), (
+        "Убедитесь, что `read_spool` читает открытые файлы, которые не"
+        " изменялись дольше EMAIL_SPOOL_MAX_AGE."
+    )
@@ -0,0 +1,29 @@
+from django.db import connection
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_sqlite_pragmas_applied(settings):
+    if connection.vendor != "sqlite":
+        pytest.skip("Настройки соединения относятся только к SQLite.")
+    busy_timeout = settings.SQLITE_PRAGMAS["busy_timeout"]
+    assert _pragma("busy_timeout") == busy_timeout, (
+        "Убедитесь, что при открытии соединения с SQLite задаётся"
+        " `busy_timeout`."
+    )
+    assert _pragma("synchronous") == 1, (
+        "Убедитесь, что при открытии соединения с SQLite задаётся"
+        " `synchronous = NORMAL`."
+    )
+    assert _pragma("temp_store") == 2, (
+        "Убедитесь, что при открытии соединения с SQLite задаётся"
+        " `temp_store = MEMORY`."
+    )
@@ -0,0 +1,122 @@
+from django.db.models import Model
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_category_unpublish_refreshes_visibility(
+        post_with_published_location: Model, published_category: Model
+):
+    from blog.models import Post
+
+    post = post_with_published_location
+    assert Post.post_objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что опубликованный пост в опубликованной категории"
+        " виден в ленте."
+    )
+
+    published_category.is_published = False
+    published_category.save()
+    assert not Post.post_objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что после снятия категории с публикации её посты"
+        " пропадают из ленты."
+    )
+
+    published_category.is_published = True
+    published_category.save()
+    assert Post.post_objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что после возврата категории в публикацию её посты"
+        " снова видны в ленте."
+    )
+
+    published_category.delete()
+    assert not Post.post_objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что посты удалённой категории не видны в ленте."
+    )
+
+
+def test_category_edit_keeps_posts_untouched(
+        post_with_published_location: Model, published_category: Model
+):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    published_category.title = "Новое название"
+    with CaptureQueriesContext(connection) as queries:
+        published_category.save()
+    assert not [
+        query for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ], (
+        "Убедитесь, что видимость публикаций пересчитывается, только если"
+        " изменился признак публикации категории."
+    )
+
+
+def test_refresh_post_visibility_command(
+        post_with_published_location: Model
+):
+    from django.core.management import call_command
+
+    from blog.models import Post
+
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(is_visible=False)
+    call_command("refresh_post_visibility")
+    post.refresh_from_db()
+    assert post.is_visible
+
+
+def test_loaddata_computes_visibility(user: Model, tmp_path):
+    import json
+
+    from django.core.management import call_command
+
+    from blog.models import Post
+
+    fixture = [
+        {
+            "model": "blog.post", "pk": 1,
+            "fields": {
+                "title": "Публикация", "text": "Текст", "author": user.pk,
+                "category": 1, "pub_date": "2020-01-01T00:00:00Z",
+                "created_at": "2020-01-01T00:00:00Z",
+                "updated_at": "2020-01-01T00:00:00Z",
+            },
+        },
+        {
+            "model": "blog.category", "pk": 1,
+            "fields": {
+                "title": "Категория", "description": "Описание",
+                "slug": "category", "created_at": "2020-01-01T00:00:00Z",
+            },
+        },
+    ]
+    path = tmp_path / "fixture.json"
+    path.write_text(json.dumps(fixture), encoding="utf-8")
+    call_command("loaddata", str(path), verbosity=0)
+    assert Post.post_objects.filter(pk=1).exists(), (
+        "Убедитесь, что публикации, загруженные командой `loaddata`,"
+        " видны в ленте."
+    )
+
+
+def test_loaddata_db_json():
+    from pathlib import Path
+
+    from django.core.management import call_command
+
+    from blog.models import Post
+
+    fixture = Path(__file__).resolve().parent.parent / "db.json"
+    call_command("loaddata", str(fixture), verbosity=0)
+    assert Post.objects.exists() and not Post.objects.filter(
+        updated_at__isnull=True
+    ).exists(), (
+        "Убедитесь, что команда `loaddata` загружает `db.json`"
+        " и заполняет дату изменения публикаций."
+    )
+    assert Post.post_objects.exists(), (
+        "Убедитесь, что публикации из `db.json` видны в ленте."
+    )
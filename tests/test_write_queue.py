@@ -0,0 +1,141 @@
+import threading
+
+from django.db import IntegrityError
+
+import pytest
+
+from blog.models import Comment
+from blog.write_queue import WriteQueue, WriteQueueClosed, stop_write_queue
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def test_write_queue_group_commit(user, post_with_published_location):
+    post = post_with_published_location
+    write_queue = WriteQueue(max_delay=0.05)
+    threads = [
+        threading.Thread(
+            target=write_queue.submit,
+            args=(Comment.objects.create,),
+            kwargs={"text": "Комментарий", "author": user, "post": post},
+        )
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    write_queue.stop()
+
+    post.refresh_from_db()
+    assert post.comments.count() == post.comment_count == 20, (
+        "Убедитесь, что очередь записи сохраняет все комментарии"
+        " и обновляет счётчик комментариев публикации."
+    )
+    assert write_queue.batches < write_queue.items, (
+        "Убедитесь, что очередь записи объединяет записи"
+        " в общие транзакции."
+    )
+
+
+def test_write_queue_error_isolated(user, post_with_published_location):
+    post = post_with_published_location
+    write_queue = WriteQueue(max_delay=0.2)
+    results = {}
+
+    def submit(name, post_id):
+        try:
+            results[name] = write_queue.submit(
+                Comment.objects.create, text="Комментарий", author=user,
+                post_id=post_id,
+            )
+        except IntegrityError as error:
+            results[name] = error
+
+    threads = [
+        threading.Thread(target=submit, args=("broken", 0)),
+        threading.Thread(target=submit, args=("valid", post.id)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    write_queue.stop()
+
+    assert isinstance(results["broken"], IntegrityError), (
+        "Убедитесь, что ошибка записи возвращается вызывающему потоку."
+    )
+    assert Comment.objects.filter(pk=results["valid"].pk).exists(), (
+        "Убедитесь, что ошибка одной записи в очереди не мешает"
+        " сохранению остальных."
+    )
+
+
+def test_comment_create_through_write_queue(
+        settings, user_client, post_with_published_location
+):
+    settings.WRITE_QUEUE_ENABLED = True
+    post = post_with_published_location
+    try:
+        response = user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": "Комментарий"}
+        )
+    finally:
+        stop_write_queue()
+    assert response.status_code == 302, (
+        "Убедитесь, что после добавления комментария через очередь записи"
+        " пользователь перенаправляется на страницу публикации."
+    )
+    assert post.comments.filter(text="Комментарий").exists()
+
+
+def test_write_queue_survives_errors(
+        monkeypatch, user, post_with_published_location
+):
+    from django.db.backends.base.base import BaseDatabaseWrapper
+
+    post = post_with_published_location
+    original = BaseDatabaseWrapper.close_if_unusable_or_obsolete
+    calls = []
+
+    def broken(self):
+        calls.append(self)
+        if len(calls) == 1:
+            raise RuntimeError("сбой после фиксации пачки")
+        return original(self)
+
+    monkeypatch.setattr(
+        BaseDatabaseWrapper, "close_if_unusable_or_obsolete", broken
+    )
+    write_queue = WriteQueue(max_delay=0)
+    for _ in range(2):
+        write_queue.submit(
+            Comment.objects.create, text="Комментарий", author=user,
+            post=post,
+        )
+    assert post.comments.count() == 2, (
+        "Убедитесь, что поток-писатель продолжает работу после ошибки"
+        " вне записи пачки."
+    )
+    write_queue.stop()
+    with pytest.raises(WriteQueueClosed):
+        write_queue.submit(Comment.objects.count)
+
+
+def test_write_falls_back_when_writer_stopped(
+        settings, monkeypatch, user, post_with_published_location
+):
+    from blog import write_queue as module
+
+    settings.WRITE_QUEUE_ENABLED = True
+    stopped = WriteQueue()
+    stopped.stop()
+    monkeypatch.setattr(module, "get_write_queue", lambda: stopped)
+    comment = module.write(
+        Comment.objects.create, text="Комментарий", author=user,
+        post=post_with_published_location,
+    )
+    assert Comment.objects.filter(pk=comment.pk).exists(), (
+        "Убедитесь, что при остановленном потоке-писателе запись"
+        " выполняется на месте."
+    )